@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+from config import (
+    YEAR, WEEK1_TEST_NUMBER, WEEK1_DAYS, WEEK2_TEST_NUMBER, WEEK2_DAYS,
+    BASELINE_YEAR, BASELINE_TEST_NUMBER, BASELINE_TEST_DAYS, INLAP_THRESHOLD_FACTOR,
+    ASYNC_LOAD_WORKERS, RENDER_WORKERS, FIGURE_CACHE, OUTPUT_DIR,
+)
+import data_loader
+import profiling
+from long_runs import identify_long_runs
+from calibration import compute_long_run_pace, WCC_STANDINGS
+from pipeline import (
+    WEEKS, WEEK_FIGURES, WEEK_COMPARISONS, CALIBRATION_PLOTS, CALIBRATION_WEEK_PLOTS,
+    PRINTERS, table_jobs,
+)
+
+MODULES = [key for key, *_ in WEEK_FIGURES] + ["speed_traces", "calibration"]
+RUN_KEYS = ["Team", "Driver", "Day", "Stint"]
+
+
+def week_specs(baseline_year=None, baseline_test=None):
+    return {
+        "w1": (YEAR, WEEK1_TEST_NUMBER, WEEK1_DAYS, 1),
+        "w2": (YEAR, WEEK2_TEST_NUMBER, WEEK2_DAYS, 2),
+        "base": (baseline_year or BASELINE_YEAR, baseline_test or BASELINE_TEST_NUMBER, BASELINE_TEST_DAYS, None),
+    }
+
+
+def summarise_session(laps):
+    laps = laps.reset_index(drop=True)
+    timed = laps.dropna(subset=["LapTime"])
+    best = timed["LapTimeSeconds"].min()
+    candidates = data_loader.filter_accurate(timed)
+    clean = candidates[candidates["LapTimeSeconds"] <= best * INLAP_THRESHOLD_FACTOR]
+    return {
+        "laps": laps,
+        "best": best,
+        "candidates": candidates,
+        "clean": clean,
+        "long_runs": identify_long_runs(clean),
+    }
+
+
+def session_work(year, test_number, day, week=None):
+    _, laps = data_loader.session_laps(year, test_number, day, week)
+    return summarise_session(laps)
+
+
+def merge_sessions(sessions):
+    best = min((s["best"] for s in sessions if pd.notna(s["best"])), default=float("nan"))
+    threshold = best * INLAP_THRESHOLD_FACTOR
+    clean, runs, offset = [], [], 0
+    for s in sessions:
+        part = s["candidates"][s["candidates"]["LapTimeSeconds"] <= threshold]
+        runs.append(s["long_runs"] if len(part) == len(s["clean"]) else identify_long_runs(part))
+        clean.append(part.set_axis(part.index + offset))
+        offset += len(s["laps"])
+
+    clean = pd.concat(clean)
+    long_runs = pd.concat(runs).sort_values(RUN_KEYS).reset_index(drop=True)
+    return {
+        "laps": pd.concat([s["laps"] for s in sessions], ignore_index=True),
+        "clean": clean,
+        "long_runs": long_runs,
+        "pace": compute_long_run_pace(clean, long_runs=long_runs),
+    }
+
+
+def _failed(exc):
+    return {"saved": [], "errors": [(None, f"{type(exc).__name__}: {exc}", traceback.format_exc())], "extras": ()}
+
+
+async def orchestrate(modules=None, weeks=None, baseline_year=None, baseline_test=None, fmt=None,
+                      load_workers=None, render_workers=None, use_cache=None):
+    import figure_cache
+    from lap_index import build_lap_index
+    from render import figure_job, render_job, to_plain, report, _init_worker
+    from calibration import build_calibration_table, build_comparison_table, build_week_comparison_table
+
+    loop = asyncio.get_running_loop()
+    specs = week_specs(baseline_year, baseline_test)
+    modules = modules or MODULES
+    weeks = [week for week in WEEKS if week in (weeks or WEEKS)]
+    manifest = figure_cache.load_manifest() if (FIGURE_CACHE if use_cache is None else use_cache) else None
+    load_times, futures = {}, {}
+
+    load_pool = ThreadPoolExecutor(max_workers=load_workers or ASYNC_LOAD_WORKERS)
+    compute_pool = ThreadPoolExecutor(max_workers=1)
+    local_pool = ThreadPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(profiling.settings(),))
+    render_pool = ProcessPoolExecutor(max_workers=render_workers or RENDER_WORKERS or os.cpu_count() or 1,
+                                      initializer=_init_worker, initargs=(profiling.settings(),))
+
+    def compute(func, *args):
+        return loop.run_in_executor(compute_pool, func, *args)
+
+    def once(name, factory):
+        if name not in futures:
+            futures[name] = asyncio.ensure_future(factory())
+        return futures[name]
+
+    async def load_one(label, day):
+        year, test_number, _, week = specs[label]
+        start = time.perf_counter()
+        summary = await loop.run_in_executor(load_pool, session_work, year, test_number, day, week)
+        load_times[(label, day)] = time.perf_counter() - start
+        print(f"  [loaded] {label} day {day} ({load_times[(label, day)]:.2f}s, {len(summary['laps'])} laps)")
+        return summary
+
+    async def build_week(label):
+        sessions = await asyncio.gather(*(load_one(label, day) for day in specs[label][2]))
+        return await compute(merge_sessions, sessions)
+
+    async def value(label, kind):
+        data = await once(f"week_{label}", lambda: build_week(label))
+        if kind != "index":
+            return data[kind]
+
+        async def index():
+            return await compute(build_lap_index, data["laps"])
+        return await once(f"index_{label}", index)
+
+    async def render(job):
+        key = None
+        if manifest is not None:
+            key = await compute(figure_cache.job_key, job)
+            outcome = figure_cache.lookup(manifest, job, key)
+            if outcome is not None:
+                outcome["cached"] = True
+                report([job], [outcome], PRINTERS)
+                return outcome
+
+        try:
+            if job["local"]:
+                outcome = await loop.run_in_executor(local_pool, render_job, job)
+            else:
+                outcome = await loop.run_in_executor(render_pool, render_job, dict(job, args=to_plain(job["args"])))
+        except Exception as exc:
+            outcome = _failed(exc)
+        profiling.merge(outcome.pop("profile", []))
+        if manifest is not None and not outcome["errors"]:
+            figure_cache.record(manifest, job, key, outcome)
+        outcome["cached"] = False
+        report([job], [outcome], PRINTERS)
+        return outcome
+
+    async def week_figure(label, key, title, module, function, kinds, local):
+        data = await asyncio.gather(*(value(label, kind) for kind in kinds))
+        return [await render(figure_job(f"{title} ({WEEKS[label][0]})", module, function, *data,
+                                        prefix=f"{label}_{key}", local=local, fmt=fmt))]
+
+    async def comparison_figure(key, title, module, kind):
+        w1, w2 = await asyncio.gather(value("w1", kind), value("w2", kind))
+        return [await render(figure_job(title, module, "generate_week_comparison", w1, w2,
+                                        prefix=f"compare_{key}", fmt=fmt))]
+
+    async def speed_traces(label):
+        index, base = await asyncio.gather(value(label, "index"), value("base", "index"))
+        title = f"Module 4: Speed Traces ({YEAR} {WEEKS[label][0]} vs {specs['base'][0]})"
+        return [await render(figure_job(title, "speed_traces", "generate_speed_traces", index, base,
+                                        prefix=f"{label}_speed_traces", local=True, fmt=fmt))]
+
+    async def calibration(label):
+        base, pace = await asyncio.gather(value("base", "pace"), value(label, "pace"))
+        year = specs["base"][0]
+        tables = (await compute(build_calibration_table, base, year),
+                  await compute(build_comparison_table, base, pace, year))
+        jobs = table_jobs(f"Module 5: Calibration ({WEEKS[label][0]} standalone)", f"{label}_calibration",
+                          CALIBRATION_PLOTS, tables, fmt)
+        return await asyncio.gather(*(render(job) for job in jobs))
+
+    async def calibration_weeks():
+        paces = await asyncio.gather(value("base", "pace"), value("w1", "pace"), value("w2", "pace"))
+        table = await compute(build_week_comparison_table, *paces, specs["base"][0])
+        jobs = table_jobs("Module 5b: Calibration Week-over-Week", "compare_calibration",
+                          CALIBRATION_WEEK_PLOTS, (table,), fmt)
+        return await asyncio.gather(*(render(job) for job in jobs))
+
+    tasks = []
+    for label in weeks:
+        tasks += [week_figure(label, *spec) for spec in WEEK_FIGURES if spec[0] in modules]
+        if "speed_traces" in modules:
+            tasks.append(speed_traces(label))
+        if "calibration" in modules:
+            tasks.append(calibration(label))
+    if len(weeks) == len(WEEKS):
+        tasks += [comparison_figure(*spec) for spec in WEEK_COMPARISONS if spec[0] in modules]
+        if "calibration" in modules:
+            tasks.append(calibration_weeks())
+
+    try:
+        outcomes = [outcome for group in await asyncio.gather(*tasks) for outcome in group]
+    finally:
+        for pool in [load_pool, compute_pool, local_pool, render_pool]:
+            pool.shutdown(wait=True)
+        if manifest is not None:
+            figure_cache.evict_stale(manifest)
+            figure_cache.save_manifest(manifest)
+    return outcomes, load_times
+
+
+def print_latency(load_times, elapsed):
+    if not load_times:
+        return
+    times = list(load_times.values())
+    print(f"\n{len(times)} session loads: slowest {max(times):.1f}s, sum {sum(times):.1f}s; "
+          f"end-to-end {elapsed:.1f}s")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Run analysis modules with loads, compute and renders overlapped")
+    parser.add_argument("--modules", nargs="+", choices=MODULES, default=None)
+    parser.add_argument("--weeks", nargs="+", choices=list(WEEKS), default=None)
+    parser.add_argument("--baseline-year", type=int, default=None)
+    parser.add_argument("--baseline-test", type=int, default=None)
+    parser.add_argument("--figure-format", choices=["png", "pdf", "svg"], default=None)
+    parser.add_argument("--load-workers", type=int, default=None)
+    parser.add_argument("--render-workers", type=int, default=None)
+    parser.add_argument("--offline", action="store_true")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    if args.baseline_year is not None and args.baseline_year not in WCC_STANDINGS:
+        parser.error(f"no championship standings for --baseline-year {args.baseline_year}; "
+                     f"choose one of {sorted(WCC_STANDINGS)}")
+    profiling.enable_from_args(args)
+
+    from plotting import apply_theme
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    data_loader.setup(offline=args.offline)
+    apply_theme()
+
+    start = time.perf_counter()
+    with data_loader.retain_sessions():
+        outcomes, load_times = asyncio.run(orchestrate(
+            args.modules, args.weeks, args.baseline_year, args.baseline_test, args.figure_format,
+            args.load_workers, args.render_workers,
+        ))
+    cached = sum(1 for outcome in outcomes if outcome.get("cached"))
+    print(f"\nFigure cache: {cached} hits, {len(outcomes) - cached} misses")
+    print_latency(load_times, time.perf_counter() - start)
+    profiling.finish()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,206 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config import BACKTEST_DIR, BACKTEST_TESTS, BACKTEST_WORKERS, LONG_RUN_MIN_LAPS, INLAP_THRESHOLD_FACTOR
+from calibration import compute_long_run_pace, WCC_STANDINGS
+import synthetic
+
+
+def season_test(year):
+    return BACKTEST_TESTS.get(year, (1, [1, 2, 3]))
+
+
+def pace_cache_path(year, source, min_laps=None):
+    threshold = min_laps or LONG_RUN_MIN_LAPS
+    test_number, days = season_test(year)
+    days = "-".join(str(day) for day in days)
+    return BACKTEST_DIR / (
+        f"pace_{source}_{year}_test{test_number}_days{days}_min{threshold}_inlap{INLAP_THRESHOLD_FACTOR:g}.csv"
+    )
+
+
+def load_season_laps(year, source="cache"):
+    test_number, days = season_test(year)
+
+    if source == "synthetic":
+        return synthetic.generate_test_laps(year, test_number, days)
+
+    from data_loader import setup, load_test
+    setup(offline=True)
+    _, laps = load_test(year, test_number, days)
+    return laps
+
+
+def compute_season_pace(year, source="cache", min_laps=None, refresh=False):
+    path = pace_cache_path(year, source, min_laps)
+    if path.exists() and not refresh:
+        return pd.read_csv(path)
+
+    from data_loader import get_clean_laps
+    laps = load_season_laps(year, source)
+    pace = compute_long_run_pace(get_clean_laps(laps), min_laps=min_laps)
+    if not pace.empty:
+        pace.insert(0, "Year", year)
+
+    BACKTEST_DIR.mkdir(parents=True, exist_ok=True)
+    pace.to_csv(path, index=False)
+    return pace
+
+
+def _season_job(args):
+    year, source, min_laps, refresh = args
+    try:
+        return year, compute_season_pace(year, source, min_laps, refresh), None
+    except Exception as exc:
+        return year, pd.DataFrame(), f"{type(exc).__name__}: {exc}"
+
+
+def compute_pace_tables(seasons, source="cache", min_laps=None, workers=None, refresh=False):
+    jobs = [(year, source, min_laps, refresh) for year in seasons]
+    n_workers = min(workers or BACKTEST_WORKERS, len(jobs))
+
+    if n_workers <= 1:
+        results = [_season_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_season_job, jobs))
+
+    tables = {}
+    for year, pace, error in results:
+        if error is not None:
+            print(f"  Warning: {year} backtest season failed ({error})")
+            continue
+        if pace.empty:
+            print(f"  Warning: No long runs found in {year} data")
+            continue
+        tables[year] = pace
+    return tables
+
+
+def standings_from_mapping(year, mapping):
+    return pd.DataFrame(
+        [{"Year": year, "Team": team, "WCC_Finish": pos} for team, pos in mapping.items()]
+    )
+
+
+def load_standings(path):
+    standings = pd.read_csv(path)
+    missing = {"Year", "Team", "WCC_Finish"} - set(standings.columns)
+    if missing:
+        raise ValueError(f"Standings table missing columns: {sorted(missing)}")
+    return standings
+
+
+def rank_correlation(a, b):
+    if len(a) < 2:
+        return np.nan
+    ra = pd.Series(a).rank().values
+    rb = pd.Series(b).rank().values
+    if ra.std() == 0 or rb.std() == 0:
+        return np.nan
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def score_season(pace, standings):
+    merged = pace.merge(standings[["Team", "WCC_Finish"]], on="Team", how="inner")
+    if merged.empty:
+        return None
+
+    merged["PredictedRank"] = merged["MeanLongRunPace"].rank(method="first").astype(int)
+    merged["ActualRank"] = merged["WCC_Finish"].rank(method="first").astype(int)
+    shift = (merged["PredictedRank"] - merged["ActualRank"]).abs()
+
+    top_n = min(3, len(merged))
+    predicted_top = set(merged.nsmallest(top_n, "PredictedRank")["Team"])
+    actual_top = set(merged.nsmallest(top_n, "ActualRank")["Team"])
+
+    return {
+        "Teams": len(merged),
+        "SpearmanRho": rank_correlation(merged["PredictedRank"], merged["ActualRank"]),
+        "MeanAbsShift": shift.mean(),
+        "MaxAbsShift": shift.max(),
+        "ExactHits": int((shift == 0).sum()),
+        "Top3Overlap": len(predicted_top & actual_top) / top_n,
+        "WinnerHit": bool(
+            merged.loc[merged["PredictedRank"] == 1, "Team"].iloc[0]
+            == merged.loc[merged["ActualRank"] == 1, "Team"].iloc[0]
+        ),
+    }
+
+
+def score_backtest(pace_tables, standings):
+    rows = []
+    for year in sorted(pace_tables):
+        season_standings = standings[standings["Year"] == year]
+        if season_standings.empty:
+            print(f"  Warning: No standings supplied for {year}")
+            continue
+        score = score_season(pace_tables[year], season_standings)
+        if score is None:
+            print(f"  Warning: No team names matched standings for {year}")
+            continue
+        rows.append({"Year": year, **score})
+    return pd.DataFrame(rows)
+
+
+def run_backtest(seasons, standings, source="cache", min_laps=None, workers=None, refresh=False):
+    pace_tables = compute_pace_tables(seasons, source, min_laps, workers, refresh)
+    scores = score_backtest(pace_tables, standings)
+    return scores, pace_tables
+
+
+def plot_backtest_scores(scores):
+    from plotting import apply_theme, create_figure, add_watermark
+    apply_theme()
+
+    if scores.empty:
+        return None
+
+    fig, axes = create_figure(width=14, height=6, ncols=2)
+    years = scores["Year"].astype(str)
+
+    axes[0].bar(years, scores["SpearmanRho"], color="#2166AC")
+    axes[0].axhline(y=0, color="#333333", linewidth=0.8)
+    axes[0].set_ylim(-1, 1)
+    axes[0].set_ylabel("Spearman Rank Correlation")
+    axes[0].set_title("Testing Rank vs WCC Finish")
+
+    axes[1].bar(years, scores["MeanAbsShift"], color="#E8002D")
+    axes[1].set_ylabel("Mean Absolute Position Change")
+    axes[1].set_title("Average Testing-to-Season Position Error")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Backtest testing long run pace against WCC standings.")
+    parser.add_argument("--seasons", type=int, nargs="+", default=sorted(BACKTEST_TESTS))
+    parser.add_argument("--source", choices=["cache", "synthetic"], default="cache")
+    parser.add_argument("--standings", help="CSV with Year, Team, WCC_Finish columns")
+    parser.add_argument("--workers", type=int, default=BACKTEST_WORKERS)
+    parser.add_argument("--refresh", action="store_true")
+    args = parser.parse_args()
+
+    if args.standings:
+        standings = load_standings(args.standings)
+    elif args.source == "synthetic":
+        standings = pd.concat(
+            [synthetic.generate_standings(year) for year in args.seasons], ignore_index=True
+        )
+    else:
+        standings = pd.concat(
+            [standings_from_mapping(year, mapping) for year, mapping in WCC_STANDINGS.items()], ignore_index=True
+        )
+
+    scores, _ = run_backtest(
+        args.seasons, standings, source=args.source,
+        workers=args.workers, refresh=args.refresh,
+    )
+    print(scores.to_string(index=False))
+
+
+if __name__ == "__main__":
+    run()
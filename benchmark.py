@@ -0,0 +1,188 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config import (
+    BENCHMARK_SCALES, BENCHMARK_SEED, BENCHMARK_REPEATS, BENCHMARK_TIME_BUDGET,
+    BENCHMARK_TELEMETRY_LAPS, BENCHMARK_TOLERANCE, BENCHMARK_RESULTS, BENCHMARK_BASELINE,
+)
+from synthetic import generate_test_laps
+from data_loader import get_clean_laps
+from long_runs import identify_long_runs, get_long_run_laps
+from calibration import compute_long_run_pace, build_comparison_table
+from distributions import compute_team_stats
+from reliability import compute_laps_per_team_day, compute_total_laps, compute_stint_summary, compute_laps_per_driver
+from speed_traces import interpolate_to_common_distance
+
+DAYS_PER_EVENT = 3
+FIRST_SEASON = 2016
+
+
+def synthetic_laps(seasons, events, seed=None):
+    seed = BENCHMARK_SEED if seed is None else seed
+    frames = []
+    for season in range(seasons):
+        for event in range(events):
+            first_day = (season * events + event) * DAYS_PER_EVENT + 1
+            frames.append(generate_test_laps(
+                FIRST_SEASON + season, event + 1, days=range(first_day, first_day + DAYS_PER_EVENT),
+                seed=seed * 100_000 + season * 1000 + event,
+            ))
+    return pd.concat(frames, ignore_index=True)
+
+
+def synthetic_telemetry(n_laps, seed=None, n_samples=700, lap_length=5400.0):
+    rng = np.random.default_rng(BENCHMARK_SEED if seed is None else seed)
+    tels = []
+    for _ in range(n_laps):
+        distance = np.sort(rng.uniform(0, lap_length, n_samples))
+        wave = np.sin(distance / 300 + rng.uniform(0, 0.2))
+        tels.append(pd.DataFrame({
+            "Distance": distance,
+            "Speed": 200 + 100 * wave,
+            "Throttle": np.clip(50 + 60 * wave, 0, 100),
+            "Brake": wave < -0.8,
+            "nGear": np.clip(np.round(5 + 3 * wave), 1, 8).astype(int),
+            "DRS": np.zeros(n_samples, dtype=int),
+        }))
+    return tels
+
+
+def scale_data(seasons, events, seed=None):
+    laps = synthetic_laps(seasons, events, seed)
+    clean = get_clean_laps(laps)
+    long_runs = identify_long_runs(clean)
+    return {
+        "laps": laps,
+        "clean": clean,
+        "long_runs": long_runs,
+        "pace": compute_long_run_pace(clean, long_runs=long_runs),
+        "telemetry": synthetic_telemetry(seasons * events * BENCHMARK_TELEMETRY_LAPS, seed),
+    }
+
+
+KERNELS = {
+    "get_clean_laps": lambda d: get_clean_laps(d["laps"]),
+    "identify_long_runs": lambda d: identify_long_runs(d["clean"]),
+    "get_long_run_laps": lambda d: get_long_run_laps(d["clean"], d["long_runs"]),
+    "compute_long_run_pace": lambda d: compute_long_run_pace(d["clean"]),
+    "compute_team_stats": lambda d: compute_team_stats(d["clean"]),
+    "compute_laps_per_team_day": lambda d: compute_laps_per_team_day(d["laps"]),
+    "compute_total_laps": lambda d: compute_total_laps(d["laps"]),
+    "compute_stint_summary": lambda d: compute_stint_summary(d["laps"]),
+    "compute_laps_per_driver": lambda d: compute_laps_per_driver(d["laps"]),
+    "build_comparison_table": lambda d: build_comparison_table(d["pace"], d["pace"]),
+    "interpolate_to_common_distance": lambda d: [interpolate_to_common_distance(tel) for tel in d["telemetry"]],
+}
+
+
+def time_kernel(func, data, repeats=None, budget=None):
+    repeats = repeats or BENCHMARK_REPEATS
+    budget = BENCHMARK_TIME_BUDGET if budget is None else budget
+    times = []
+    while len(times) < repeats and (not times or sum(times) < budget):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_benchmarks(scales=None, kernels=None, repeats=None, seed=None):
+    results = []
+    for scale in scales or list(BENCHMARK_SCALES):
+        seasons, events = BENCHMARK_SCALES[scale]
+        start = time.perf_counter()
+        data = scale_data(seasons, events, seed)
+        print(f"{scale}: {len(data['laps'])} laps, {len(data['long_runs'])} long runs, "
+              f"{len(data['telemetry'])} telemetry laps ({time.perf_counter() - start:.1f}s to generate)")
+
+        for name in kernels or list(KERNELS):
+            times = time_kernel(KERNELS[name], data, repeats)
+            results.append({
+                "kernel": name,
+                "scale": scale,
+                "laps": len(data["laps"]),
+                "repeats": len(times),
+                "best": min(times),
+                "median": float(np.median(times)),
+            })
+            print(f"  {name:<32} {min(times) * 1000:10.2f} ms  (best of {len(times)})")
+    return results
+
+
+def save_results(results, path, seed=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "created": time.time(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "seed": BENCHMARK_SEED if seed is None else seed,
+        "results": results,
+    }, indent=1))
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare_results(results, baseline, tolerance=None, kernels=None):
+    tolerance = BENCHMARK_TOLERANCE if tolerance is None else tolerance
+    current = pd.DataFrame(results, columns=["kernel", "scale", "best"]).set_index(["kernel", "scale"])["best"]
+    previous = pd.DataFrame(baseline).set_index(["kernel", "scale"])["best"]
+    expected = previous.index.get_level_values("scale").isin(current.index.get_level_values("scale"))
+    if kernels:
+        expected &= previous.index.get_level_values("kernel").isin(kernels)
+    table = pd.DataFrame({"Baseline": previous[expected], "Current": current}).dropna(subset=["Baseline"])
+    table = table.reset_index()
+    table["Ratio"] = table["Current"] / table["Baseline"]
+    table["Regression"] = table["Ratio"] > 1 + tolerance
+    table["Missing"] = table["Current"].isna()
+    return table.rename(columns={"kernel": "Kernel", "scale": "Scale"})
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Benchmark the compute kernels on seeded synthetic data")
+    parser.add_argument("--scales", nargs="+", choices=list(BENCHMARK_SCALES), default=None)
+    parser.add_argument("--kernels", nargs="+", choices=list(KERNELS), default=None)
+    parser.add_argument("--repeats", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=str(BENCHMARK_RESULTS))
+    parser.add_argument("--baseline", default=str(BENCHMARK_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.kernels, args.repeats, args.seed)
+    print(f"\nResults written to {save_results(results, Path(args.out), args.seed)}")
+
+    baseline = Path(args.baseline)
+    if args.save_baseline:
+        print(f"Baseline written to {save_results(results, baseline, args.seed)}")
+        return
+    if not baseline.exists():
+        print(f"No baseline at {baseline}; run with --save-baseline to create one")
+        return
+
+    table = compare_results(results, load_results(baseline), args.tolerance, args.kernels)
+    print(f"\n{table.round(4).to_string(index=False)}")
+    regressions = table[table["Regression"]]
+    missing = table[table["Missing"]]
+    if not missing.empty:
+        print(f"\n{len(missing)} baseline results missing from this run: "
+              f"{', '.join(f'{k} ({s})' for k, s in zip(missing['Kernel'], missing['Scale']))}")
+    if not regressions.empty:
+        print(f"\n{len(regressions)} regressions beyond tolerance")
+    if not (regressions.empty and missing.empty):
+        sys.exit(1)
+    print("\nNo regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    run()
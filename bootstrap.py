@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mcolors
+from config import (
+    BOOTSTRAP_RESAMPLES, BOOTSTRAP_CI, BOOTSTRAP_SEED, BOOTSTRAP_CHUNK,
+    TEAM_COLORS, FALLBACK_COLOR,
+)
+from plotting import apply_theme, create_figure, add_watermark
+from long_runs import identify_long_runs
+
+
+def build_run_matrix(long_runs):
+    grouped = long_runs.groupby("Team")["MeanTime"]
+    teams = sorted(grouped.groups)
+    counts = grouped.count().reindex(teams).values
+    max_runs = counts.max()
+
+    runs = np.full((len(teams), max_runs), np.nan)
+    positions = grouped.cumcount().values
+    team_idx = pd.Index(teams).get_indexer(long_runs["Team"])
+    runs[team_idx, positions] = long_runs["MeanTime"].values
+    return teams, runs, counts
+
+
+def resample_team_pace(runs, counts, n_resamples, rng):
+    n_teams, max_runs = runs.shape
+    idx = (rng.random((n_resamples, n_teams, max_runs)) * counts[None, :, None]).astype(np.intp)
+    values = runs[np.arange(n_teams)[None, :, None], idx]
+    valid = np.arange(max_runs)[None, None, :] < counts[None, :, None]
+    return np.where(valid, values, 0.0).sum(axis=2) / counts[None, :]
+
+
+def bootstrap_long_run_ranks(laps, n_resamples=None, min_laps=None, ci=None, seed=None, long_runs=None):
+    if long_runs is None:
+        long_runs = identify_long_runs(laps, min_laps=min_laps)
+    if long_runs.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    n_resamples = n_resamples or BOOTSTRAP_RESAMPLES
+    ci = ci or BOOTSTRAP_CI
+    rng = np.random.default_rng(BOOTSTRAP_SEED if seed is None else seed)
+
+    teams, runs, counts = build_run_matrix(long_runs)
+    n_teams = len(teams)
+
+    rank_counts = np.zeros(n_teams * n_teams, dtype=np.int64)
+    deltas = np.empty((n_resamples, n_teams))
+    offsets = np.arange(n_teams) * n_teams
+
+    for start in range(0, n_resamples, BOOTSTRAP_CHUNK):
+        size = min(BOOTSTRAP_CHUNK, n_resamples - start)
+        pace = resample_team_pace(runs, counts, size, rng)
+        ranks = pace.argsort(axis=1).argsort(axis=1)
+        rank_counts += np.bincount((ranks + offsets).ravel(), minlength=n_teams * n_teams)
+        deltas[start:start + size] = pace - pace.min(axis=1, keepdims=True)
+
+    rank_probs = pd.DataFrame(
+        rank_counts.reshape(n_teams, n_teams) / n_resamples,
+        index=pd.Index(teams, name="Team"),
+        columns=pd.RangeIndex(1, n_teams + 1, name="Rank"),
+    )
+
+    tail = (1 - ci) / 2 * 100
+    low, median, high = np.percentile(deltas, [tail, 50, 100 - tail], axis=0)
+    observed = np.nanmean(runs, axis=1)
+
+    summary = pd.DataFrame({
+        "Team": teams,
+        "MeanLongRunPace": observed,
+        "NumLongRuns": counts,
+        "ObservedDelta": observed - observed.min(),
+        "DeltaMedian": median,
+        "DeltaLow": low,
+        "DeltaHigh": high,
+        "ProbFastest": rank_probs[1].values,
+        "ExpectedRank": rank_probs.values @ rank_probs.columns.values,
+        "ModalRank": rank_probs.values.argmax(axis=1) + 1,
+    })
+    return summary.sort_values("ExpectedRank").reset_index(drop=True), rank_probs
+
+
+def plot_rank_distribution(summary, rank_probs, ci=None):
+    apply_theme()
+
+    if summary.empty:
+        return None
+
+    order = summary["Team"].tolist()
+    probs = rank_probs.loc[order]
+
+    fig, axes = create_figure(width=16, height=8, ncols=2)
+
+    cmap = mcolors.LinearSegmentedColormap.from_list("", ["#F5F5F5", "#2166AC"])
+    im = axes[0].imshow(probs.values, cmap=cmap, aspect="auto", vmin=0, vmax=1)
+    axes[0].set_yticks(range(len(order)))
+    axes[0].set_yticklabels(order)
+    axes[0].set_xticks(range(probs.shape[1]))
+    axes[0].set_xticklabels([f"P{r}" for r in probs.columns])
+    axes[0].grid(False)
+
+    for i in range(probs.shape[0]):
+        for j in range(probs.shape[1]):
+            val = probs.iloc[i, j]
+            if val >= 0.01:
+                text_color = "white" if val > 0.6 else "#333333"
+                axes[0].text(j, i, f"{val:.0%}", ha="center", va="center",
+                             fontsize=8, color=text_color)
+
+    fig.colorbar(im, ax=axes[0], shrink=0.8, label="P(rank = k)")
+    axes[0].set_title("Bootstrapped Long Run Rank Probability")
+
+    y = np.arange(len(order))
+    colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in order]
+    err = np.vstack([
+        summary["DeltaMedian"] - summary["DeltaLow"],
+        summary["DeltaHigh"] - summary["DeltaMedian"],
+    ])
+    axes[1].errorbar(
+        summary["DeltaMedian"], y, xerr=err,
+        fmt="none", ecolor="#888888", elinewidth=2, capsize=4, zorder=3,
+    )
+    axes[1].scatter(summary["DeltaMedian"], y, color=colors, s=80,
+                    edgecolors="#333333", linewidth=0.5, zorder=5)
+    axes[1].set_yticks(y)
+    axes[1].set_yticklabels(order)
+    axes[1].invert_yaxis()
+    axes[1].set_xlabel("Delta to Long Run Pace Leader (seconds)")
+    axes[1].set_title(f"Delta to Leader ({ci or BOOTSTRAP_CI:.0%} interval)")
+
+    for i, n in enumerate(summary["NumLongRuns"]):
+        axes[1].text(summary["DeltaHigh"].iloc[i] + 0.05, i, f"n={n}",
+                     va="center", fontsize=9, color="#666666")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(laps, long_runs=None, ci=None):
+    figures = {}
+    summary, rank_probs = bootstrap_long_run_ranks(laps, ci=ci, long_runs=long_runs)
+    figures["rank_distribution"] = plot_rank_distribution(summary, rank_probs, ci)
+    return figures, summary
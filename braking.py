@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from config import (
+    BRAKE_ON_THRESHOLD, BRAKE_MIN_LENGTH, THROTTLE_PICKUP_THRESHOLD,
+    CORNER_MERGE_DISTANCE, TEAM_COLORS, FALLBACK_COLOR,
+)
+from plotting import apply_theme, create_figure, add_watermark
+
+
+def find_runs(mask):
+    n_laps, n_points = mask.shape
+    padded = np.zeros((n_laps, n_points + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    lap, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    return lap, start, end
+
+
+def next_true_index(mask):
+    n_points = mask.shape[1]
+    idx = np.where(mask, np.arange(n_points), n_points)
+    return np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+
+
+def segment_argmin(values, starts):
+    seg_min = np.minimum.reduceat(values, starts)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+    positions = np.where(values == seg_min[segment], np.arange(len(values)), len(values))
+    return np.minimum.reduceat(positions, starts)
+
+
+def assign_corners(apex_distance, merge_distance=None):
+    gap = merge_distance or CORNER_MERGE_DISTANCE
+    order = np.argsort(apex_distance)
+    breaks = np.diff(apex_distance[order]) > gap
+    corners = np.empty(len(order), dtype=int)
+    corners[order] = np.concatenate([[1], 1 + np.cumsum(breaks)])
+    return corners
+
+
+def detect_braking_events(batch, grid, channels, min_length=None):
+    speed = batch[:, channels.index("Speed")]
+    brake = batch[:, channels.index("Brake")] > BRAKE_ON_THRESHOLD
+    throttle = batch[:, channels.index("Throttle")]
+    n_laps, n_points = speed.shape
+
+    lap, start, end = find_runs(brake)
+    keep = grid[end - 1] - grid[start] >= (min_length or BRAKE_MIN_LENGTH)
+    lap, start, end = lap[keep], start[keep], end[keep]
+    if len(lap) == 0:
+        return pd.DataFrame()
+
+    flat_starts = lap * n_points + start
+    lap_starts = np.arange(n_laps) * n_points
+    bounds = np.union1d(flat_starts, lap_starts)
+    apex_flat = segment_argmin(speed.ravel(), bounds)[np.searchsorted(bounds, flat_starts)]
+    apex = apex_flat - lap * n_points
+
+    pickup_idx = next_true_index(throttle >= THROTTLE_PICKUP_THRESHOLD)[lap, apex]
+    pickup = np.where(pickup_idx < n_points, grid[np.minimum(pickup_idx, n_points - 1)], np.nan)
+
+    events = pd.DataFrame({
+        "Lap": lap,
+        "BrakeStart": grid[start],
+        "BrakeEnd": grid[end - 1],
+        "BrakeLength": grid[end - 1] - grid[start],
+        "EntrySpeed": speed[lap, start],
+        "ApexDistance": grid[apex],
+        "ApexSpeed": speed[lap, apex],
+        "ThrottlePickup": pickup,
+    })
+    events["ApexToPickup"] = events["ThrottlePickup"] - events["ApexDistance"]
+    events.insert(1, "Corner", assign_corners(events["ApexDistance"].values))
+    return events
+
+
+def summarise_by_corner(events, labels):
+    if events.empty:
+        return pd.DataFrame()
+
+    tagged = events.assign(Team=np.asarray(labels)[events["Lap"].values])
+    tagged = tagged.sort_values("BrakeLength", ascending=False).drop_duplicates(["Lap", "Corner"])
+    medians = tagged.groupby("Corner")[["BrakeStart", "ApexSpeed"]].transform("median")
+    tagged["BrakeStartVsMedian"] = tagged["BrakeStart"] - medians["BrakeStart"]
+    tagged["ApexSpeedVsMedian"] = tagged["ApexSpeed"] - medians["ApexSpeed"]
+    return tagged.sort_values(["Corner", "Team"]).reset_index(drop=True)
+
+
+def plot_braking_signatures(corner_table):
+    apply_theme()
+
+    if corner_table.empty:
+        return None
+
+    fig, axes = create_figure(width=16, height=9, nrows=2)
+    corners = sorted(corner_table["Corner"].unique())
+    teams = sorted(corner_table["Team"].unique())
+    width = 0.8 / max(len(teams), 1)
+
+    for i, team in enumerate(teams):
+        data = corner_table[corner_table["Team"] == team]
+        x = data["Corner"].values - 0.4 + width * (i + 0.5)
+        color = TEAM_COLORS.get(team, FALLBACK_COLOR)
+        axes[0].bar(x, data["BrakeStartVsMedian"], width=width, color=color, label=team)
+        axes[1].bar(x, data["ApexSpeedVsMedian"], width=width, color=color)
+
+    for ax in axes:
+        ax.axhline(y=0, color="#333333", linewidth=0.8)
+        ax.set_xticks(corners)
+        ax.set_xticklabels([f"C{c}" for c in corners])
+
+    axes[0].set_ylabel("Brake Point vs Median (m, positive = later)")
+    axes[0].set_title("Braking Signatures: Brake Point by Corner")
+    axes[0].legend(loc="upper right", ncol=min(len(teams), 5), fontsize=8)
+    axes[1].set_ylabel("Apex Speed vs Median (km/h)")
+    axes[1].set_xlabel("Corner (ordered by apex distance)")
+    axes[1].set_title("Braking Signatures: Minimum Corner Speed")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(lap_index, compound=None):
+    from speed_traces import load_team_best_laps
+
+    figures = {}
+    records, batch, grid, channels = load_team_best_laps(lap_index, compound=compound)
+    if records.empty or not {"Brake", "Throttle"} <= set(channels):
+        return figures, pd.DataFrame()
+
+    events = detect_braking_events(batch, grid, channels)
+    corner_table = summarise_by_corner(events, records["Team"].values)
+    figures["signatures"] = plot_braking_signatures(corner_table)
+    return figures, corner_table
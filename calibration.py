@@ -1,79 +1,160 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from config import LONG_RUN_MIN_LAPS, TEAM_COLORS, FALLBACK_COLOR
+from lazy_imports import lazy_import
+from config import LONG_RUN_MIN_LAPS, TEAM_COLORS, FALLBACK_COLOR, BASELINE_YEAR
 from plotting import (
     apply_theme, create_figure, add_watermark, save_figure,
 )
 from long_runs import identify_long_runs
 
-
-WCC_2025 = {
-    "McLaren": 1,
-    "Mercedes": 2,
-    "Red Bull Racing": 3,
-    "Red Bull": 3,
-    "Ferrari": 4,
-    "Williams": 5,
-    "Williams Racing": 5,
-    "Racing Bulls": 6,
-    "RB": 6,
-    "Aston Martin": 7,
-    "Aston Martin Racing": 7,
-    "Haas F1 Team": 8,
-    "Haas": 8,
-    "Kick Sauber": 9,
-    "Alpine": 10,
-    "Alpine F1 Team": 10,
+plt = lazy_import("matplotlib.pyplot")
+mpatches = lazy_import("matplotlib.patches")
+
+
+WCC_STANDINGS = {
+    2024: {
+        "McLaren": 1,
+        "Ferrari": 2,
+        "Red Bull Racing": 3,
+        "Red Bull": 3,
+        "Mercedes": 4,
+        "Aston Martin": 5,
+        "Aston Martin Racing": 5,
+        "Alpine": 6,
+        "Alpine F1 Team": 6,
+        "Haas F1 Team": 7,
+        "Haas": 7,
+        "RB": 8,
+        "Williams": 9,
+        "Williams Racing": 9,
+        "Kick Sauber": 10,
+    },
+    2025: {
+        "McLaren": 1,
+        "Mercedes": 2,
+        "Red Bull Racing": 3,
+        "Red Bull": 3,
+        "Ferrari": 4,
+        "Williams": 5,
+        "Williams Racing": 5,
+        "Racing Bulls": 6,
+        "RB": 6,
+        "Aston Martin": 7,
+        "Aston Martin Racing": 7,
+        "Haas F1 Team": 8,
+        "Haas": 8,
+        "Kick Sauber": 9,
+        "Alpine": 10,
+        "Alpine F1 Team": 10,
+    },
 }
 
-WCC_2025_POINTS = {
-    "McLaren": 833,
-    "Mercedes": 469,
-    "Red Bull Racing": 451,
-    "Red Bull": 451,
-    "Ferrari": 398,
-    "Williams": 137,
-    "Williams Racing": 137,
-    "Racing Bulls": 92,
-    "RB": 92,
-    "Aston Martin": 89,
-    "Aston Martin Racing": 89,
-    "Haas F1 Team": 79,
-    "Haas": 79,
-    "Kick Sauber": 70,
-    "Alpine": 22,
-    "Alpine F1 Team": 22,
+WCC_POINTS = {
+    2024: {
+        "McLaren": 666,
+        "Ferrari": 652,
+        "Red Bull Racing": 589,
+        "Red Bull": 589,
+        "Mercedes": 468,
+        "Aston Martin": 94,
+        "Aston Martin Racing": 94,
+        "Alpine": 65,
+        "Alpine F1 Team": 65,
+        "Haas F1 Team": 58,
+        "Haas": 58,
+        "RB": 46,
+        "Williams": 17,
+        "Williams Racing": 17,
+        "Kick Sauber": 4,
+    },
+    2025: {
+        "McLaren": 833,
+        "Mercedes": 469,
+        "Red Bull Racing": 451,
+        "Red Bull": 451,
+        "Ferrari": 398,
+        "Williams": 137,
+        "Williams Racing": 137,
+        "Racing Bulls": 92,
+        "RB": 92,
+        "Aston Martin": 89,
+        "Aston Martin Racing": 89,
+        "Haas F1 Team": 79,
+        "Haas": 79,
+        "Kick Sauber": 70,
+        "Alpine": 22,
+        "Alpine F1 Team": 22,
+    },
 }
 
-WCC_2025_NOTES = {
-    "Red Bull Racing": "Verstappen scored 421 of 451 team points",
-    "Red Bull": "Verstappen scored 421 of 451 team points",
+WCC_NOTES = {
+    2025: {
+        "Red Bull Racing": "Verstappen scored 421 of 451 team points",
+        "Red Bull": "Verstappen scored 421 of 451 team points",
+    },
 }
 
-TEAM_NAME_MAP_2025_TO_2026 = {
-    "McLaren": "McLaren",
-    "Mercedes": "Mercedes",
-    "Red Bull Racing": "Red Bull Racing",
-    "Red Bull": "Red Bull",
-    "Ferrari": "Ferrari",
-    "Williams": "Williams",
-    "Williams Racing": "Williams",
-    "Racing Bulls": "Racing Bulls",
-    "RB": "Racing Bulls",
-    "Aston Martin": "Aston Martin",
-    "Aston Martin Racing": "Aston Martin",
-    "Haas F1 Team": "Haas F1 Team",
-    "Haas": "Haas",
-    "Kick Sauber": "Audi",
-    "Alpine": "Alpine",
-    "Alpine F1 Team": "Alpine",
+TEAM_NAME_MAPS_TO_2026 = {
+    2024: {
+        "McLaren": "McLaren",
+        "Ferrari": "Ferrari",
+        "Red Bull Racing": "Red Bull Racing",
+        "Red Bull": "Red Bull",
+        "Mercedes": "Mercedes",
+        "Aston Martin": "Aston Martin",
+        "Aston Martin Racing": "Aston Martin",
+        "Alpine": "Alpine",
+        "Alpine F1 Team": "Alpine",
+        "Haas F1 Team": "Haas F1 Team",
+        "Haas": "Haas",
+        "RB": "Racing Bulls",
+        "Williams": "Williams",
+        "Williams Racing": "Williams",
+        "Kick Sauber": "Audi",
+    },
+    2025: {
+        "McLaren": "McLaren",
+        "Mercedes": "Mercedes",
+        "Red Bull Racing": "Red Bull Racing",
+        "Red Bull": "Red Bull",
+        "Ferrari": "Ferrari",
+        "Williams": "Williams",
+        "Williams Racing": "Williams",
+        "Racing Bulls": "Racing Bulls",
+        "RB": "Racing Bulls",
+        "Aston Martin": "Aston Martin",
+        "Aston Martin Racing": "Aston Martin",
+        "Haas F1 Team": "Haas F1 Team",
+        "Haas": "Haas",
+        "Kick Sauber": "Audi",
+        "Alpine": "Alpine",
+        "Alpine F1 Team": "Alpine",
+    },
 }
 
 
-def compute_long_run_pace(laps, min_laps=None):
-    long_runs = identify_long_runs(laps, min_laps=min_laps)
+def check_baseline_year(baseline_year=None):
+    year = baseline_year or BASELINE_YEAR
+    if year not in WCC_STANDINGS:
+        raise ValueError(
+            f"No championship standings for {year}; baseline year must be one of {sorted(WCC_STANDINGS)}"
+        )
+    return year
+
+
+def baseline_year_of(table):
+    return int(table["BaselineYear"].iloc[0])
+
+
+def laps_year(laps):
+    if "Year" in laps.columns and laps["Year"].nunique() == 1:
+        return int(laps["Year"].iloc[0])
+    return None
+
+
+def compute_long_run_pace(laps, min_laps=None, long_runs=None):
+    if long_runs is None:
+        long_runs = identify_long_runs(laps, min_laps=min_laps)
 
     if long_runs.empty:
         return pd.DataFrame()
@@ -95,82 +176,95 @@ def compute_long_run_pace(laps, min_laps=None):
     return team_pace.sort_values("TestingRank")
 
 
-def build_calibration_table(pace_2025):
-    if pace_2025.empty:
+def build_calibration_table(pace_base, baseline_year=None):
+    year = check_baseline_year(baseline_year)
+    if pace_base.empty:
         return pd.DataFrame()
 
-    table = pace_2025.copy()
-    table["WCC_Finish"] = table["Team"].map(WCC_2025).fillna(0).astype(int)
-    table["WCC_Points"] = table["Team"].map(WCC_2025_POINTS).fillna(0).astype(int)
+    table = pace_base.copy()
+    table["BaselineYear"] = year
+    table["WCC_Finish"] = table["Team"].map(WCC_STANDINGS[year]).fillna(0).astype(int)
+    table["WCC_Points"] = table["Team"].map(WCC_POINTS[year]).fillna(0).astype(int)
     table["PositionShift"] = table["TestingRank"] - table["WCC_Finish"]
-    table["Notes"] = table["Team"].map(WCC_2025_NOTES).fillna("")
+    table["Notes"] = table["Team"].map(WCC_NOTES.get(year, {})).fillna("")
 
     return table.sort_values("TestingRank")
 
 
-def build_comparison_table(pace_2025, pace_2026):
-    if pace_2025.empty or pace_2026.empty:
-        return pd.DataFrame()
-
-    cal_2025 = build_calibration_table(pace_2025)
-
-    rows = []
-    for _, row_25 in cal_2025.iterrows():
-        team_2025 = row_25["Team"]
-        team_2026 = TEAM_NAME_MAP_2025_TO_2026.get(team_2025, team_2025)
-
-        match_2026 = pace_2026[pace_2026["Team"] == team_2026]
-
-        entry = {
-            "Team_2025": team_2025,
-            "Team_2026": team_2026,
-            "Testing_Delta_2025": row_25["DeltaToLeader"],
-            "Testing_Rank_2025": row_25["TestingRank"],
-            "WCC_Finish_2025": row_25["WCC_Finish"],
-            "WCC_Points_2025": row_25["WCC_Points"],
-            "Position_Shift_2025": row_25["PositionShift"],
-            "Notes": row_25["Notes"],
-        }
-
-        if not match_2026.empty:
-            r26 = match_2026.iloc[0]
-            entry["Testing_Delta_2026"] = r26["DeltaToLeader"]
-            entry["Testing_Rank_2026"] = r26["TestingRank"]
-            entry["NumLongRuns_2026"] = r26["NumLongRuns"]
-        else:
-            entry["Testing_Delta_2026"] = np.nan
-            entry["Testing_Rank_2026"] = np.nan
-            entry["NumLongRuns_2026"] = 0
-
-        rows.append(entry)
-
-    new_2026_teams = set(pace_2026["Team"]) - set(
-        TEAM_NAME_MAP_2025_TO_2026.get(t, t) for t in pace_2025["Team"]
-    )
-    for team_2026 in sorted(new_2026_teams):
-        match = pace_2026[pace_2026["Team"] == team_2026]
-        if not match.empty:
-            r26 = match.iloc[0]
-            rows.append({
-                "Team_2025": "(new entry)",
-                "Team_2026": team_2026,
-                "Testing_Delta_2025": np.nan,
-                "Testing_Rank_2025": np.nan,
-                "WCC_Finish_2025": np.nan,
-                "WCC_Points_2025": np.nan,
-                "Position_Shift_2025": np.nan,
-                "Notes": "New team for 2026",
-                "Testing_Delta_2026": r26["DeltaToLeader"],
-                "Testing_Rank_2026": r26["TestingRank"],
-                "NumLongRuns_2026": r26["NumLongRuns"],
-            })
+def _baseline_entry(row, year):
+    team_map = TEAM_NAME_MAPS_TO_2026[year]
+    return {
+        "BaselineYear": year,
+        f"Team_{year}": row["Team"],
+        "Team_2026": team_map.get(row["Team"], row["Team"]),
+        f"Testing_Delta_{year}": row["DeltaToLeader"],
+        f"Testing_Rank_{year}": row["TestingRank"],
+        f"WCC_Finish_{year}": row["WCC_Finish"],
+        f"WCC_Points_{year}": row["WCC_Points"],
+        f"Position_Shift_{year}": row["PositionShift"],
+        "Notes": row["Notes"],
+    }
+
+
+def _new_entry(team_2026, year):
+    return {
+        "BaselineYear": year,
+        f"Team_{year}": "(new entry)",
+        "Team_2026": team_2026,
+        f"Testing_Delta_{year}": np.nan,
+        f"Testing_Rank_{year}": np.nan,
+        f"WCC_Finish_{year}": np.nan,
+        f"WCC_Points_{year}": np.nan,
+        f"Position_Shift_{year}": np.nan,
+        "Notes": "New team for 2026",
+    }
+
+
+def _add_pace(entry, pace, label):
+    match = pace[pace["Team"] == entry["Team_2026"]]
+    if not match.empty:
+        r = match.iloc[0]
+        entry[f"Testing_Delta_{label}"] = r["DeltaToLeader"]
+        entry[f"Testing_Rank_{label}"] = r["TestingRank"]
+        entry[f"NumLongRuns_{label}"] = r["NumLongRuns"]
+    else:
+        entry[f"Testing_Delta_{label}"] = np.nan
+        entry[f"Testing_Rank_{label}"] = np.nan
+        entry[f"NumLongRuns_{label}"] = 0
+    return entry
+
+
+def _comparison_rows(pace_base, paces, baseline_year):
+    year = check_baseline_year(baseline_year)
+    cal_base = build_calibration_table(pace_base, year)
+    rows = [_baseline_entry(row, year) for _, row in cal_base.iterrows()]
+
+    team_map = TEAM_NAME_MAPS_TO_2026[year]
+    mapped = set(team_map.get(t, t) for t in pace_base["Team"])
+    new_teams = set()
+    for pace in paces.values():
+        new_teams |= set(pace["Team"]) - mapped
+    rows += [_new_entry(team, year) for team in sorted(new_teams)]
 
+    for entry in rows:
+        for label, pace in paces.items():
+            _add_pace(entry, pace, label)
     return pd.DataFrame(rows)
 
 
+def build_comparison_table(pace_base, pace_2026, baseline_year=None):
+    check_baseline_year(baseline_year)
+    if pace_base.empty or pace_2026.empty:
+        return pd.DataFrame()
+    return _comparison_rows(pace_base, {"2026": pace_2026}, baseline_year)
+
+
 def plot_bump_chart(calibration_table):
     apply_theme()
 
+    if calibration_table.empty:
+        return None
+    year = baseline_year_of(calibration_table)
     valid = calibration_table[
         calibration_table["WCC_Finish"].notna()
         & (calibration_table["WCC_Finish"] > 0)
@@ -210,17 +304,18 @@ def plot_bump_chart(calibration_table):
     ax.set_xlim(-0.4, 1.4)
     ax.set_ylim(max_rank + 0.5, 0.5)
     ax.set_xticks([0, 1])
-    ax.set_xticklabels(["Testing Long Run Rank", "2025 WCC Finish"], fontsize=13, fontweight="bold")
+    ax.set_xticklabels(["Testing Long Run Rank", f"{year} WCC Finish"], fontsize=13, fontweight="bold")
     ax.set_yticks(range(1, int(max_rank) + 1))
     ax.set_ylabel("Position")
-    ax.set_title("2025 Testing Long Run Pace vs Season Outcome")
+    ax.set_title(f"{year} Testing Long Run Pace vs Season Outcome")
     ax.grid(True, axis="y", alpha=0.3)
     ax.grid(False, axis="x")
 
-    if any(valid["Notes"].str.len() > 0):
+    notes = valid.loc[valid["Notes"].str.len() > 0, "Notes"].unique()
+    if len(notes):
         ax.text(
             0.5, max_rank + 0.3,
-            "* Verstappen scored 421 of Red Bull's 451 points",
+            "* " + "; ".join(notes),
             ha="center", va="top", fontsize=9, style="italic", color="#666666",
             transform=ax.transData,
         )
@@ -233,7 +328,10 @@ def plot_bump_chart(calibration_table):
 def plot_delta_comparison(comparison_table):
     apply_theme()
 
-    valid = comparison_table.dropna(subset=["Testing_Delta_2025", "Testing_Delta_2026"]).copy()
+    if comparison_table.empty:
+        return None
+    year = baseline_year_of(comparison_table)
+    valid = comparison_table.dropna(subset=[f"Testing_Delta_{year}", "Testing_Delta_2026"]).copy()
     if valid.empty:
         return None
 
@@ -249,7 +347,7 @@ def plot_delta_comparison(comparison_table):
         color = TEAM_COLORS.get(team, FALLBACK_COLOR)
 
         ax.barh(
-            i - bar_height / 2, row["Testing_Delta_2025"],
+            i - bar_height / 2, row[f"Testing_Delta_{year}"],
             height=bar_height, color=color, alpha=0.4,
             edgecolor=color, linewidth=1,
         )
@@ -259,10 +357,10 @@ def plot_delta_comparison(comparison_table):
             edgecolor=color, linewidth=1,
         )
 
-        wcc = row.get("WCC_Finish_2025")
+        wcc = row.get(f"WCC_Finish_{year}")
         if pd.notna(wcc) and wcc > 0:
             ax.text(
-                max(row["Testing_Delta_2025"], row["Testing_Delta_2026"]) + 0.15,
+                max(row[f"Testing_Delta_{year}"], row["Testing_Delta_2026"]) + 0.15,
                 i,
                 f"WCC P{int(wcc)}",
                 va="center", fontsize=9, color="#666666",
@@ -271,10 +369,10 @@ def plot_delta_comparison(comparison_table):
     ax.set_yticks(list(y_positions))
     ax.set_yticklabels(valid["Team_2026"], fontsize=11)
     ax.set_xlabel("Delta to Long Run Pace Leader (seconds)")
-    ax.set_title("Testing Long Run Pace Gap: 2025 vs 2026 (with 2025 Season Outcome)")
+    ax.set_title(f"Testing Long Run Pace Gap: {year} vs 2026 (with {year} Season Outcome)")
 
     legend_elements = [
-        mpatches.Patch(facecolor="#888888", alpha=0.4, edgecolor="#888888", label="2025 Testing Gap"),
+        mpatches.Patch(facecolor="#888888", alpha=0.4, edgecolor="#888888", label=f"{year} Testing Gap"),
         mpatches.Patch(facecolor="#888888", alpha=0.9, edgecolor="#888888", label="2026 Testing Gap"),
     ]
     ax.legend(handles=legend_elements, loc="lower right", fontsize=11)
@@ -288,16 +386,19 @@ def plot_delta_comparison(comparison_table):
 def plot_shift_analysis(comparison_table):
     apply_theme()
 
+    if comparison_table.empty:
+        return None
+    year = baseline_year_of(comparison_table)
     valid = comparison_table.dropna(
-        subset=["Testing_Rank_2025", "Testing_Rank_2026", "WCC_Finish_2025"]
+        subset=[f"Testing_Rank_{year}", "Testing_Rank_2026", f"WCC_Finish_{year}"]
     ).copy()
     if valid.empty:
         return None
 
     fig, axes = create_figure(width=16, height=7, ncols=2)
 
-    valid["TestingToSeason_2025"] = abs(valid["Testing_Rank_2025"] - valid["WCC_Finish_2025"])
-    mean_shift = valid["TestingToSeason_2025"].mean()
+    valid["TestingToSeason"] = abs(valid[f"Testing_Rank_{year}"] - valid[f"WCC_Finish_{year}"])
+    mean_shift = valid["TestingToSeason"].mean()
 
     valid_sorted = valid.sort_values("Testing_Rank_2026")
     for i, (_, row) in enumerate(valid_sorted.iterrows()):
@@ -306,20 +407,20 @@ def plot_shift_analysis(comparison_table):
 
         axes[0].plot(
             [0, 1, 2],
-            [row["Testing_Rank_2025"], row["WCC_Finish_2025"], row["Testing_Rank_2026"]],
+            [row[f"Testing_Rank_{year}"], row[f"WCC_Finish_{year}"], row["Testing_Rank_2026"]],
             color=color, linewidth=2.5, alpha=0.8,
             marker="o", markersize=8, markeredgecolor="white",
         )
 
     max_rank = max(
-        valid["Testing_Rank_2025"].max(),
-        valid["WCC_Finish_2025"].max(),
+        valid[f"Testing_Rank_{year}"].max(),
+        valid[f"WCC_Finish_{year}"].max(),
         valid["Testing_Rank_2026"].max(),
     )
     axes[0].set_xlim(-0.3, 2.3)
     axes[0].set_ylim(max_rank + 0.5, 0.5)
     axes[0].set_xticks([0, 1, 2])
-    axes[0].set_xticklabels(["2025 Testing", "2025 WCC", "2026 Testing"], fontsize=10)
+    axes[0].set_xticklabels([f"{year} Testing", f"{year} WCC", "2026 Testing"], fontsize=10)
     axes[0].set_ylabel("Position")
     axes[0].set_title("Team Trajectory: Testing \u2192 Season \u2192 Testing")
 
@@ -334,12 +435,12 @@ def plot_shift_analysis(comparison_table):
     colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in valid_sorted["Team_2026"]]
     bars = axes[1].barh(
         valid_sorted["Team_2026"],
-        valid_sorted["TestingToSeason_2025"],
+        valid_sorted["TestingToSeason"],
         color=colors, alpha=0.7,
     )
     axes[1].axvline(x=mean_shift, color="#333333", linewidth=1.5, linestyle="--", label=f"Mean: {mean_shift:.1f}")
     axes[1].set_xlabel("Absolute Position Change (Testing → Season)")
-    axes[1].set_title("How Much Did 2025 Testing Rank Differ from Season Finish?")
+    axes[1].set_title(f"How Much Did {year} Testing Rank Differ from Season Finish?")
     axes[1].legend(fontsize=10)
     axes[1].invert_yaxis()
 
@@ -348,100 +449,45 @@ def plot_shift_analysis(comparison_table):
     return fig
 
 
-def generate_all(clean_2025, clean_2026):
+def generate_all(clean_base, clean_2026, baseline_year=None):
     figures = {}
+    year = check_baseline_year(baseline_year or laps_year(clean_base))
 
-    pace_2025 = compute_long_run_pace(clean_2025)
+    pace_base = compute_long_run_pace(clean_base)
     pace_2026 = compute_long_run_pace(clean_2026)
 
-    if pace_2025.empty:
-        print("  Warning: No long runs found in 2025 data")
+    if pace_base.empty:
+        print(f"  Warning: No long runs found in {year} data")
         return figures
     if pace_2026.empty:
         print("  Warning: No long runs found in 2026 data")
         return figures
 
-    calibration = build_calibration_table(pace_2025)
-    comparison = build_comparison_table(pace_2025, pace_2026)
+    calibration = build_calibration_table(pace_base, year)
+    comparison = build_comparison_table(pace_base, pace_2026, year)
 
     figures["bump_chart"] = plot_bump_chart(calibration)
     figures["delta_comparison"] = plot_delta_comparison(comparison)
     figures["shift_analysis"] = plot_shift_analysis(comparison)
 
-    return figures, pace_2025, pace_2026, comparison
+    return figures, pace_base, pace_2026, comparison
 
 
-def build_week_comparison_table(pace_2025, pace_w1, pace_w2):
-    if pace_2025.empty or pace_w1.empty or pace_w2.empty:
+def build_week_comparison_table(pace_base, pace_w1, pace_w2, baseline_year=None):
+    check_baseline_year(baseline_year)
+    if pace_base.empty or pace_w1.empty or pace_w2.empty:
         return pd.DataFrame()
-
-    cal_2025 = build_calibration_table(pace_2025)
-
-    rows = []
-    for _, row_25 in cal_2025.iterrows():
-        team_2025 = row_25["Team"]
-        team_2026 = TEAM_NAME_MAP_2025_TO_2026.get(team_2025, team_2025)
-
-        entry = {
-            "Team_2025": team_2025,
-            "Team_2026": team_2026,
-            "Testing_Delta_2025": row_25["DeltaToLeader"],
-            "Testing_Rank_2025": row_25["TestingRank"],
-            "WCC_Finish_2025": row_25["WCC_Finish"],
-            "WCC_Points_2025": row_25["WCC_Points"],
-            "Notes": row_25["Notes"],
-        }
-
-        for label, pace_df in [("W1", pace_w1), ("W2", pace_w2)]:
-            match = pace_df[pace_df["Team"] == team_2026]
-            if not match.empty:
-                r = match.iloc[0]
-                entry[f"Testing_Delta_{label}"] = r["DeltaToLeader"]
-                entry[f"Testing_Rank_{label}"] = r["TestingRank"]
-                entry[f"NumLongRuns_{label}"] = r["NumLongRuns"]
-            else:
-                entry[f"Testing_Delta_{label}"] = np.nan
-                entry[f"Testing_Rank_{label}"] = np.nan
-                entry[f"NumLongRuns_{label}"] = 0
-
-        rows.append(entry)
-
-    all_mapped = set(TEAM_NAME_MAP_2025_TO_2026.get(t, t) for t in pace_2025["Team"])
-    new_teams = set()
-    for pdf in [pace_w1, pace_w2]:
-        new_teams |= set(pdf["Team"]) - all_mapped
-
-    for team_2026 in sorted(new_teams):
-        entry = {
-            "Team_2025": "(new entry)",
-            "Team_2026": team_2026,
-            "Testing_Delta_2025": np.nan,
-            "Testing_Rank_2025": np.nan,
-            "WCC_Finish_2025": np.nan,
-            "WCC_Points_2025": np.nan,
-            "Notes": "New team for 2026",
-        }
-        for label, pace_df in [("W1", pace_w1), ("W2", pace_w2)]:
-            match = pace_df[pace_df["Team"] == team_2026]
-            if not match.empty:
-                r = match.iloc[0]
-                entry[f"Testing_Delta_{label}"] = r["DeltaToLeader"]
-                entry[f"Testing_Rank_{label}"] = r["TestingRank"]
-                entry[f"NumLongRuns_{label}"] = r["NumLongRuns"]
-            else:
-                entry[f"Testing_Delta_{label}"] = np.nan
-                entry[f"Testing_Rank_{label}"] = np.nan
-                entry[f"NumLongRuns_{label}"] = 0
-        rows.append(entry)
-
-    return pd.DataFrame(rows)
+    return _comparison_rows(pace_base, {"W1": pace_w1, "W2": pace_w2}, baseline_year)
 
 
 def plot_week_trajectory(week_comparison):
     apply_theme()
 
+    if week_comparison.empty:
+        return None
+    year = baseline_year_of(week_comparison)
     valid = week_comparison.dropna(
-        subset=["WCC_Finish_2025", "Testing_Rank_W1", "Testing_Rank_W2"]
+        subset=[f"WCC_Finish_{year}", "Testing_Rank_W1", "Testing_Rank_W2"]
     ).copy()
     if valid.empty:
         return None
@@ -455,20 +501,20 @@ def plot_week_trajectory(week_comparison):
 
         ax.plot(
             [0, 1, 2],
-            [row["WCC_Finish_2025"], row["Testing_Rank_W1"], row["Testing_Rank_W2"]],
+            [row[f"WCC_Finish_{year}"], row["Testing_Rank_W1"], row["Testing_Rank_W2"]],
             color=color, linewidth=2.5, alpha=0.8,
             marker="o", markersize=8, markeredgecolor="white",
         )
 
     max_rank = max(
-        valid["WCC_Finish_2025"].max(),
+        valid[f"WCC_Finish_{year}"].max(),
         valid["Testing_Rank_W1"].max(),
         valid["Testing_Rank_W2"].max(),
     )
     ax.set_xlim(-0.3, 2.4)
     ax.set_ylim(max_rank + 0.5, 0.5)
     ax.set_xticks([0, 1, 2])
-    ax.set_xticklabels(["2025 WCC Finish", "2026 Week 1", "2026 Week 2"], fontsize=12, fontweight="bold")
+    ax.set_xticklabels([f"{year} WCC Finish", "2026 Week 1", "2026 Week 2"], fontsize=12, fontweight="bold")
     ax.set_ylabel("Position")
     ax.set_title("Team Trajectory: Season Result to Test Week 1 to Test Week 2")
     ax.grid(True, axis="y", alpha=0.3)
@@ -490,6 +536,9 @@ def plot_week_trajectory(week_comparison):
 def plot_delta_comparison_weeks(week_comparison):
     apply_theme()
 
+    if week_comparison.empty:
+        return None
+    year = baseline_year_of(week_comparison)
     valid = week_comparison.dropna(subset=["Testing_Delta_W1", "Testing_Delta_W2"]).copy()
     if valid.empty:
         return None
@@ -515,7 +564,7 @@ def plot_delta_comparison_weeks(week_comparison):
             edgecolor=color, linewidth=1,
         )
 
-        wcc = row.get("WCC_Finish_2025")
+        wcc = row.get(f"WCC_Finish_{year}")
         if pd.notna(wcc) and wcc > 0:
             ax.text(
                 max(row["Testing_Delta_W1"], row["Testing_Delta_W2"]) + 0.15,
@@ -527,7 +576,7 @@ def plot_delta_comparison_weeks(week_comparison):
     ax.set_yticks(list(range(len(valid))))
     ax.set_yticklabels(valid["Team_2026"], fontsize=11)
     ax.set_xlabel("Delta to Long Run Pace Leader (seconds)")
-    ax.set_title("Testing Long Run Pace Gap: Week 1 vs Week 2 (with 2025 Season Outcome)")
+    ax.set_title(f"Testing Long Run Pace Gap: Week 1 vs Week 2 (with {year} Season Outcome)")
 
     legend_elements = [
         mpatches.Patch(facecolor="#888888", alpha=0.35, edgecolor="#888888", label="Week 1"),
@@ -541,10 +590,11 @@ def plot_delta_comparison_weeks(week_comparison):
     return fig
 
 
-def generate_week_comparison(clean_2025, clean_w1, clean_w2):
+def generate_week_comparison(clean_base, clean_w1, clean_w2, baseline_year=None):
     figures = {}
+    year = check_baseline_year(baseline_year or laps_year(clean_base))
 
-    pace_2025 = compute_long_run_pace(clean_2025)
+    pace_base = compute_long_run_pace(clean_base)
     pace_w1 = compute_long_run_pace(clean_w1)
     pace_w2 = compute_long_run_pace(clean_w2)
 
@@ -552,7 +602,7 @@ def generate_week_comparison(clean_2025, clean_w1, clean_w2):
         print("  Warning: Insufficient long run data for week comparison")
         return figures, pace_w1, pace_w2, pd.DataFrame()
 
-    week_comp = build_week_comparison_table(pace_2025, pace_w1, pace_w2)
+    week_comp = build_week_comparison_table(pace_base, pace_w1, pace_w2, year)
 
     figures["week_trajectory"] = plot_week_trajectory(week_comp)
     figures["delta_comparison_weeks"] = plot_delta_comparison_weeks(week_comp)
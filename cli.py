@@ -0,0 +1,93 @@
+import argparse
+import time
+from config import OUTPUT_DIR, EXPORT_DIR, BASELINE_YEAR, BASELINE_TEST_NUMBER
+from pipeline import WEEKS, WEEK_FIGURES, analysis_stages, run_pipeline
+
+MODULES = [key for key, *_ in WEEK_FIGURES] + ["speed_traces", "calibration", "tables"]
+FIGURE_FORMATS = ["png", "pdf", "svg"]
+TABLE_FORMATS = ["csv", "json", "parquet"]
+
+
+def module_targets(stages, modules, weeks):
+    targets = []
+    for module in modules:
+        if module == "tables":
+            targets += [f"tables_{week}" for week in weeks] + ["tables_base", "calibration_table"]
+            targets += [f"comparison_{week}" for week in weeks]
+            if len(weeks) == len(WEEKS):
+                targets.append("week_comparison")
+            continue
+        targets += [f"fig_{module}_{week}" for week in weeks]
+        if len(weeks) == len(WEEKS) and f"fig_{module}_weeks" in stages:
+            targets.append(f"fig_{module}_weeks")
+    return list(dict.fromkeys(targets))
+
+
+def collect_tables(values, baseline_year):
+    labels = {"base": str(baseline_year)}
+    tables = {}
+    for name, value in values.items():
+        if name.startswith("tables_"):
+            label = name[len("tables_"):]
+            for table_name, table in value.items():
+                tables[f"{labels.get(label, label)}_{table_name}"] = table
+        elif name.startswith("comparison_"):
+            tables[f"{name[len('comparison_'):]}_comparison"] = value
+    if "calibration_table" in values:
+        tables[f"{baseline_year}_calibration"] = values["calibration_table"]
+    if "week_comparison" in values:
+        tables["w1_w2_week_comparison"] = values["week_comparison"]
+    return tables
+
+
+def loaded_sessions(order):
+    return [name[len("laps_"):] for name in order if name.startswith("laps_")]
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Run selected analysis modules for selected test weeks")
+    parser.add_argument("--modules", nargs="+", choices=MODULES, default=MODULES)
+    parser.add_argument("--weeks", nargs="+", choices=list(WEEKS), default=list(WEEKS))
+    parser.add_argument("--baseline-year", type=int, default=BASELINE_YEAR)
+    parser.add_argument("--baseline-test", type=int, default=BASELINE_TEST_NUMBER)
+    parser.add_argument("--figure-format", choices=FIGURE_FORMATS, default=None)
+    parser.add_argument("--table-format", nargs="+", choices=TABLE_FORMATS, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+
+    from calibration import WCC_STANDINGS
+    if args.baseline_year not in WCC_STANDINGS:
+        parser.error(f"no championship standings for --baseline-year {args.baseline_year}; "
+                     f"choose one of {sorted(WCC_STANDINGS)}")
+
+    from data_loader import setup, retain_sessions
+    from plotting import apply_theme
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    stages = analysis_stages(args.baseline_year, args.baseline_test, fmt=args.figure_format)
+    weeks = [week for week in WEEKS if week in args.weeks]
+    targets = module_targets(stages, args.modules, weeks)
+
+    start = time.perf_counter()
+    setup(offline=args.offline)
+    apply_theme()
+    print(f"Modules: {', '.join(args.modules)} | weeks: {', '.join(weeks)} | baseline: {args.baseline_year}")
+
+    with retain_sessions():
+        values, report = run_pipeline(stages, targets, max_workers=args.workers)
+    print(f"Sessions loaded: {', '.join(loaded_sessions(report['Stage'])) or 'none'}")
+
+    if "tables" in args.modules:
+        from export import export_tables
+
+        written = export_tables(collect_tables(values, args.baseline_year), formats=args.table_format)
+        print(f"Wrote {len(written)} table files to {EXPORT_DIR}/")
+
+    print(f"\n{report.sort_values('Seconds', ascending=False).to_string(index=False)}")
+    print(f"\nTotal: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    run()
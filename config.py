@@ -2,6 +2,12 @@ from pathlib import Path
 
 CACHE_DIR = Path("cache")
 OUTPUT_DIR = Path("output")
+EXPORT_DIR = OUTPUT_DIR / "tables"
+EXPORT_FORMATS = ["csv"]
+PROFILE_PATH = OUTPUT_DIR / "profile.json"
+PROFILE_DUMP_DIR = OUTPUT_DIR / "profiles"
+BENCHMARK_RESULTS = OUTPUT_DIR / "benchmarks.json"
+BENCHMARK_BASELINE = Path("benchmarks") / "baseline.json"
 
 YEAR = 2026
 
@@ -18,6 +24,69 @@ BASELINE_TEST_DAYS = [1, 2, 3]
 INLAP_THRESHOLD_FACTOR = 1.3
 LONG_RUN_MIN_LAPS = 10
 
+BACKTEST_DIR = CACHE_DIR / "backtest"
+BACKTEST_TESTS = {
+    2022: (2, [1, 2, 3]),
+    2023: (1, [1, 2, 3]),
+    2024: (1, [1, 2, 3]),
+    2025: (1, [1, 2, 3]),
+}
+BACKTEST_WORKERS = 4
+
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_CI = 0.9
+BOOTSTRAP_SEED = 0
+BOOTSTRAP_CHUNK = 2000
+
+BENCHMARK_SCALES = {"test": (1, 1), "season": (1, 24), "ten_seasons": (10, 24)}
+BENCHMARK_SEED = 0
+BENCHMARK_REPEATS = 5
+BENCHMARK_TIME_BUDGET = 2.0
+BENCHMARK_TELEMETRY_LAPS = 20
+BENCHMARK_TOLERANCE = 0.25
+
+TELEMETRY_CACHE_DIR = CACHE_DIR / "telemetry"
+TELEMETRY_CACHE_MAX_BYTES = 2 * 1024 ** 3
+TELEMETRY_CHANNELS = ["Distance", "Speed", "Throttle", "Brake", "nGear", "DRS"]
+TELEMETRY_WORKERS = 4
+RESAMPLE_POINTS = 1000
+MINISECTORS = 50
+
+BRAKE_ON_THRESHOLD = 0.5
+BRAKE_MIN_LENGTH = 10.0
+THROTTLE_PICKUP_THRESHOLD = 10.0
+CORNER_MERGE_DISTANCE = 100.0
+
+FULL_THROTTLE_THRESHOLD = 98.0
+STRAIGHT_MIN_LENGTH = 200.0
+CLIP_ACCEL_THRESHOLD = 0.5
+ACCEL_SMOOTHING = 5
+
+PAIRWISE_MEMORY_BYTES = 256 * 1024 ** 2
+PAIRWISE_SEGMENTS = 10
+
+LAP_SEARCH_POINTS = 256
+LAP_SEARCH_BLOCK = 4096
+LAP_SEARCH_COMPONENTS = 32
+
+PROGRAMME_CLUSTERS = 4
+PROGRAMME_INITS = 10
+PROGRAMME_MAX_ITER = 100
+PROGRAMME_SEED = 0
+PROGRAMME_COLORS = {
+    "Quali Sim": "#E8002D",
+    "Race Sim": "#2166AC",
+    "Aero / Installation": "#4D9221",
+    "Mid-Length": "#FFC633",
+}
+COMPOUND_SOFTNESS = {"HARD": 0.0, "MEDIUM": 1.0, "SOFT": 2.0}
+
+SPEED_TRACE_ERAS = [
+    {"year": 2026, "test": 2, "days": [1, 2, 3], "label": "2026", "color": "#E8002D"},
+    {"year": 2025, "test": 1, "days": [1, 2, 3], "label": "2025", "color": "#2166AC"},
+    {"year": 2022, "test": 2, "days": [1, 2, 3], "label": "2022", "color": "#4D9221"},
+]
+
 TEAM_COLORS = {
     "Red Bull Racing": "#3671C6",
     "Red Bull": "#3671C6",
@@ -55,6 +124,16 @@ COMPOUND_COLORS = {
 FALLBACK_COLOR = "#888888"
 
 FIGURE_DPI = 200
+FIGURE_FORMAT = "png"
+RENDER_WORKERS = None
+PIPELINE_WORKERS = 4
+ASYNC_LOAD_WORKERS = 9
+FIGURE_CACHE = True
+FIGURE_CACHE_DIR = CACHE_DIR / "figures"
+FIGURE_CACHE_VERSION = "1"
+FIGURE_CACHE_MAX_AGE_DAYS = 30
+TELEMETRY_DECIMATION = "lttb"
+DECIMATION_POINTS_PER_PIXEL = 0.25
 FIGURE_WIDTH = 14
 FIGURE_HEIGHT = 8
 TITLE_SIZE = 16
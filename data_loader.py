@@ -1,6 +1,8 @@
-import fastf1
+from contextlib import contextmanager
 import pandas as pd
 from packaging.version import Version
+from lazy_imports import lazy_import
+from profiling import profile_stage
 from config import (
     CACHE_DIR, YEAR,
     WEEK1_TEST_NUMBER, WEEK1_DAYS,
@@ -9,10 +11,12 @@ from config import (
     INLAP_THRESHOLD_FACTOR,
 )
 
+fastf1 = lazy_import("fastf1")
+
 MIN_FASTF1_VERSION = "3.8.0"
 
 
-def setup():
+def setup(offline=False):
     if Version(fastf1.__version__) < Version(MIN_FASTF1_VERSION):
         raise RuntimeError(
             f"FastF1 {MIN_FASTF1_VERSION}+ required for 2026 testing data. "
@@ -20,28 +24,62 @@ def setup():
         )
     CACHE_DIR.mkdir(exist_ok=True)
     fastf1.Cache.enable_cache(str(CACHE_DIR))
+    if offline:
+        fastf1.Cache.offline_mode(True)
+
+
+_loaded_sessions = {}
+_retention = {"depth": 0}
+
+
+@contextmanager
+def retain_sessions():
+    _retention["depth"] += 1
+    try:
+        yield
+    finally:
+        _retention["depth"] -= 1
+        if not _retention["depth"]:
+            _loaded_sessions.clear()
 
 
 def load_session(year, test_number, day):
-    session = fastf1.get_testing_session(year, test_number, day)
-    session.load(telemetry=True, weather=False)
+    key = (year, test_number, day)
+    session = _loaded_sessions.get(key)
+    if session is None:
+        with profile_stage(f"load {year} test {test_number} day {day}", "load"):
+            session = fastf1.get_testing_session(year, test_number, day)
+            session.load(telemetry=True, weather=False)
+        if _retention["depth"]:
+            _loaded_sessions[key] = session
     return session
 
 
+def get_session(year, test_number, day):
+    return _loaded_sessions.get((year, test_number, day))
+
+
+def session_laps(year, test_number, day, week=None):
+    session = load_session(year, test_number, day)
+
+    laps = session.laps.copy()
+    laps["Day"] = day
+    laps["Year"] = year
+    laps["Test"] = test_number
+    laps["SessionLapIndex"] = laps.index
+    if week is not None:
+        laps["Week"] = week
+    laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
+    return session, laps
+
+
 def load_test(year, test_number, days, week=None):
     sessions = []
     frames = []
 
     for day in days:
-        session = load_session(year, test_number, day)
+        session, laps = session_laps(year, test_number, day, week)
         sessions.append(session)
-
-        laps = session.laps.copy()
-        laps["Day"] = day
-        laps["Year"] = year
-        if week is not None:
-            laps["Week"] = week
-        laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
         frames.append(laps)
 
     combined = pd.concat(frames, ignore_index=True)
@@ -88,6 +126,7 @@ def filter_accurate(laps):
 
 
 def get_clean_laps(laps):
-    filtered = filter_representative(laps)
-    filtered = filter_accurate(filtered)
+    with profile_stage("clean laps", "clean"):
+        filtered = filter_representative(laps)
+        filtered = filter_accurate(filtered)
     return filtered
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mcolors
+import matplotlib.patches as mpatches
+from config import (
+    FULL_THROTTLE_THRESHOLD, BRAKE_ON_THRESHOLD, STRAIGHT_MIN_LENGTH,
+    CLIP_ACCEL_THRESHOLD, ACCEL_SMOOTHING, TEAM_COLORS, FALLBACK_COLOR,
+)
+from plotting import apply_theme, create_figure, add_watermark
+from braking import find_runs, assign_corners
+
+
+def smooth_rows(values, window=None):
+    window = window or ACCEL_SMOOTHING
+    if window <= 1:
+        return values
+    padded = np.pad(values, ((0, 0), (window // 2, window - 1 - window // 2)), mode="edge")
+    cumulative = np.cumsum(padded, axis=1)
+    cumulative = np.concatenate([np.zeros((len(values), 1)), cumulative], axis=1)
+    return (cumulative[:, window:] - cumulative[:, :-window]) / window
+
+
+def compute_acceleration(speed, grid, window=None):
+    v = smooth_rows(speed, window) / 3.6
+    return np.gradient(v ** 2 / 2, grid, axis=1)
+
+
+def detect_straights(batch, grid, channels, min_length=None):
+    speed = batch[:, channels.index("Speed")]
+    throttle = batch[:, channels.index("Throttle")]
+    full = throttle >= FULL_THROTTLE_THRESHOLD
+    if "Brake" in channels:
+        full &= batch[:, channels.index("Brake")] <= BRAKE_ON_THRESHOLD
+
+    lap, start, end = find_runs(full)
+    keep = grid[end - 1] - grid[start] >= (min_length or STRAIGHT_MIN_LENGTH)
+    return speed, lap[keep], start[keep], end[keep]
+
+
+def analyse_deployment(batch, grid, channels, min_length=None):
+    speed, lap, start, end = detect_straights(batch, grid, channels, min_length)
+    if len(lap) == 0:
+        return pd.DataFrame()
+
+    n_laps, n_points = speed.shape
+    accel = compute_acceleration(speed, grid)
+    step = np.gradient(grid)
+
+    flat_start = lap * n_points + start
+    flat_end = lap * n_points + end
+    bounds = np.union1d(np.union1d(flat_start, flat_end), np.arange(n_laps) * n_points)
+    bounds = bounds[bounds < n_laps * n_points]
+    pos = np.searchsorted(bounds, flat_start)
+
+    def reduce(ufunc, values):
+        return ufunc.reduceat(values.ravel(), bounds)[pos]
+
+    step_matrix = np.broadcast_to(step, speed.shape)
+    clipping = np.where((accel < CLIP_ACCEL_THRESHOLD) & (accel >= 0), step_matrix, 0.0)
+    derating = np.where(accel < 0, step_matrix, 0.0)
+
+    straights = pd.DataFrame({
+        "Lap": lap,
+        "Start": grid[start],
+        "End": grid[end - 1],
+        "Length": grid[end - 1] - grid[start],
+        "EntrySpeed": speed[lap, start],
+        "PeakSpeed": reduce(np.maximum, speed),
+        "ExitSpeed": speed[lap, end - 1],
+        "MinAccel": reduce(np.minimum, accel),
+        "ClipDistance": reduce(np.add, clipping),
+        "DerateDistance": reduce(np.add, derating),
+    })
+    straights["SpeedLost"] = straights["PeakSpeed"] - straights["ExitSpeed"]
+    straights["ClipShare"] = straights["ClipDistance"] / straights["Length"]
+    straights.insert(1, "Straight", assign_corners(straights["Start"].values, STRAIGHT_MIN_LENGTH))
+    return straights
+
+
+def summarise_deployment(straights, laps_meta, by=("Team", "Day")):
+    if straights.empty:
+        return pd.DataFrame()
+
+    meta = laps_meta.reset_index(drop=True)
+    tagged = straights.join(meta[[c for c in by if c not in straights.columns]], on="Lap")
+    return (
+        tagged.groupby(list(by))
+        .agg(
+            Laps=("Lap", "nunique"),
+            Straights=("Straight", "count"),
+            MeanClipDistance=("ClipDistance", "mean"),
+            MeanDerateDistance=("DerateDistance", "mean"),
+            MeanSpeedLost=("SpeedLost", "mean"),
+            MaxSpeedLost=("SpeedLost", "max"),
+        )
+        .reset_index()
+    )
+
+
+def plot_deployment_heatmap(straights, laps_meta):
+    apply_theme()
+
+    table = summarise_deployment(straights, laps_meta, by=("Team", "Straight"))
+    if table.empty:
+        return None
+
+    grid = table.pivot(index="Team", columns="Straight", values="MeanSpeedLost")
+    grid = grid.loc[grid.mean(axis=1).sort_values().index]
+
+    fig, ax = create_figure(width=14, height=8)
+    cmap = mcolors.LinearSegmentedColormap.from_list("", ["#F5F5F5", "#B2182B"])
+    im = ax.imshow(grid.values, cmap=cmap, aspect="auto")
+
+    ax.set_yticks(range(len(grid.index)))
+    ax.set_yticklabels(grid.index)
+    ax.set_xticks(range(len(grid.columns)))
+    ax.set_xticklabels([f"S{s}" for s in grid.columns])
+    ax.grid(False)
+
+    for i in range(grid.shape[0]):
+        for j in range(grid.shape[1]):
+            val = grid.iloc[i, j]
+            if pd.notna(val):
+                ax.text(j, i, f"{val:.1f}", ha="center", va="center", fontsize=10, color="#333333")
+
+    fig.colorbar(im, ax=ax, shrink=0.8, label="Speed Lost at Full Throttle (km/h)")
+    ax.set_xlabel("Straight (ordered by distance)")
+    ax.set_title("Full-Throttle Speed Loss per Straight (clipping / derating)")
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def plot_derating_by_day(straights, laps_meta):
+    apply_theme()
+
+    table = summarise_deployment(straights, laps_meta)
+    if table.empty:
+        return None
+
+    days = sorted(table["Day"].unique())
+    teams = table.groupby("Team")["MeanDerateDistance"].mean().sort_values().index.tolist()
+    height = 0.8 / len(days)
+
+    alphas = [0.35 + 0.55 * (i + 1) / len(days) for i in range(len(days))]
+    colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in teams]
+
+    fig, ax = create_figure(width=12, height=8)
+    for i, day in enumerate(days):
+        data = table[table["Day"] == day].set_index("Team").reindex(teams)
+        ax.barh(np.arange(len(teams)) - 0.4 + height * (i + 0.5), data["MeanDerateDistance"],
+                height=height, color=colors, alpha=alphas[i])
+
+    ax.set_yticks(range(len(teams)))
+    ax.set_yticklabels(teams)
+    ax.set_xlabel("Mean Distance Decelerating at Full Throttle per Straight (m)")
+    ax.set_title("Derating by Team and Day (faded = earlier day)")
+    ax.invert_yaxis()
+    legend_elements = [
+        mpatches.Patch(facecolor="#888888", alpha=alpha, label=f"Day {day}")
+        for day, alpha in zip(days, alphas)
+    ]
+    ax.legend(handles=legend_elements, loc="lower right")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(laps):
+    from speed_traces import load_lap_batch
+
+    figures = {}
+    records, batch, grid, channels = load_lap_batch(laps, channels=["Speed", "Throttle", "Brake"])
+    if records.empty:
+        return figures, pd.DataFrame()
+
+    straights = analyse_deployment(batch, grid, channels)
+    figures["speed_loss_heatmap"] = plot_deployment_heatmap(straights, records)
+    figures["derating_by_day"] = plot_derating_by_day(straights, records)
+    return figures, summarise_deployment(straights, records)
@@ -1,11 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
 from plotting import (
     apply_theme, create_figure, build_color_maps,
     get_compound_color, add_watermark, save_figure,
 )
 
+plt = lazy_import("matplotlib.pyplot")
+
 
 def compute_team_stats(laps):
     stats = (
@@ -0,0 +1,118 @@
+import argparse
+import importlib.util
+from pathlib import Path
+import pandas as pd
+from config import EXPORT_DIR, EXPORT_FORMATS
+from reliability import compute_laps_per_team_day, compute_total_laps, compute_stint_summary, compute_laps_per_driver
+from distributions import compute_team_stats
+from long_runs import identify_long_runs, compute_consistency_by_team
+from calibration import (
+    compute_long_run_pace, build_calibration_table, build_comparison_table, build_week_comparison_table, laps_year,
+)
+
+PARQUET_ENGINES = ["pyarrow", "fastparquet"]
+
+
+def compute_week_tables(laps, clean, long_runs=None, pace=None):
+    if long_runs is None:
+        long_runs = identify_long_runs(clean)
+    if pace is None:
+        pace = compute_long_run_pace(clean, long_runs=long_runs)
+    return {
+        "laps_per_team_day": compute_laps_per_team_day(laps).reset_index(),
+        "total_laps": compute_total_laps(laps),
+        "stint_summary": compute_stint_summary(laps),
+        "laps_per_driver": compute_laps_per_driver(laps),
+        "team_stats": compute_team_stats(clean),
+        "long_runs": long_runs,
+        "consistency": compute_consistency_by_team(long_runs) if not long_runs.empty else pd.DataFrame(),
+        "long_run_pace": pace,
+    }
+
+
+def compute_tables(weeks, base_label=None):
+    tables = {}
+    for label, (laps, clean) in weeks.items():
+        for name, table in compute_week_tables(laps, clean).items():
+            tables[f"{label}_{name}"] = table
+
+    if base_label is not None:
+        pace_base = tables[f"{base_label}_long_run_pace"]
+        baseline_year = laps_year(weeks[base_label][1])
+        tables[f"{base_label}_calibration"] = build_calibration_table(pace_base, baseline_year)
+        paces = {label: tables[f"{label}_long_run_pace"] for label in weeks if label != base_label}
+        for label, pace in paces.items():
+            tables[f"{label}_comparison"] = build_comparison_table(pace_base, pace, baseline_year)
+        if len(paces) == 2:
+            (l1, p1), (l2, p2) = paces.items()
+            tables[f"{l1}_{l2}_week_comparison"] = build_week_comparison_table(pace_base, p1, p2, baseline_year)
+    return tables
+
+
+def parquet_engine():
+    for engine in PARQUET_ENGINES:
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def write_table(table, path, fmt):
+    if fmt == "csv":
+        table.to_csv(path, index=False)
+    elif fmt == "json":
+        table.to_json(path, orient="records", date_format="iso", indent=1)
+    elif fmt == "parquet":
+        frame = table.copy()
+        frame.columns = [str(c) for c in frame.columns]
+        frame.to_parquet(path, index=False, engine=parquet_engine())
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_tables(tables, out_dir=None, formats=None):
+    out_dir = out_dir or EXPORT_DIR
+    formats = list(formats or EXPORT_FORMATS)
+    if "parquet" in formats and parquet_engine() is None:
+        print("  Warning: parquet export needs pyarrow or fastparquet; skipping parquet")
+        formats.remove("parquet")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, table in tables.items():
+        if table is None or table.empty:
+            continue
+        for fmt in formats:
+            path = out_dir / f"{name}.{fmt}"
+            write_table(table, path, fmt)
+            written.append(path)
+    return written
+
+
+def load_weeks(offline=False):
+    from data_loader import setup, load_2026_w1, load_2026_w2, load_2025, get_clean_laps
+
+    setup(offline=offline)
+    weeks = {}
+    for label, loader in [("2025", load_2025), ("w1", load_2026_w1), ("w2", load_2026_w2)]:
+        print(f"Loading {label}...")
+        _, laps = loader()
+        weeks[label] = (laps, get_clean_laps(laps))
+    return weeks
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Export analysis tables without rendering figures")
+    parser.add_argument("--format", nargs="+", choices=["csv", "json", "parquet"], default=None)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+
+    weeks = load_weeks(args.offline)
+    tables = compute_tables(weeks, base_label="2025")
+    out_dir = Path(args.out) if args.out else EXPORT_DIR
+    written = export_tables(tables, out_dir, formats=args.format)
+    print(f"Wrote {len(written)} files to {out_dir}/")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,177 @@
+import ast
+import hashlib
+import importlib
+import json
+import pickle
+import time
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import config
+from config import FIGURE_CACHE_DIR, FIGURE_CACHE_VERSION, FIGURE_CACHE_MAX_AGE_DAYS
+
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def _update(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(map(str, value.columns)), list(map(str, value.dtypes)))).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        except TypeError:
+            digest.update(pickle.dumps(pd.DataFrame(value)))
+    elif isinstance(value, pd.Series):
+        _update(digest, value.to_frame())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode())
+
+
+def hash_value(value):
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _parse_imports(path, mtime):
+    imported, config_names = set(), set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            imported.add(node.module.split(".")[0])
+            if node.module == "config":
+                config_names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "config":
+            config_names.add(node.attr)
+    return imported, config_names
+
+
+def _imports(path):
+    return _parse_imports(path, path.stat().st_mtime_ns)
+
+
+def _repo_modules(module):
+    found, pending = set(), [module.__name__]
+    while pending:
+        name = pending.pop()
+        path = REPO_DIR / f"{name}.py"
+        if name in found or not path.exists():
+            continue
+        found.add(name)
+        pending.extend(_imports(path)[0])
+    return [REPO_DIR / f"{name}.py" for name in sorted(found)]
+
+
+def code_version(module):
+    digest = hashlib.sha256(FIGURE_CACHE_VERSION.encode())
+    for path in _repo_modules(module):
+        digest.update(path.stem.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def config_values(module):
+    names = set()
+    for path in _repo_modules(module):
+        names.update(name for name in _imports(path)[1] if name.isupper() and hasattr(config, name))
+    return {name: getattr(config, name) for name in sorted(names)}
+
+
+def job_id(job):
+    return f"{job['module']}.{job['function']}:{job['prefix']}.{job['format']}"
+
+
+def job_key(job):
+    module = importlib.import_module(job["module"])
+    digest = hashlib.sha256()
+    for part in [job_id(job), code_version(module), hash_value(config_values(module)), hash_value(job["args"])]:
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+def manifest_path(output_dir=None):
+    return (output_dir or config.OUTPUT_DIR) / ".figure_manifest.json"
+
+
+def load_manifest(output_dir=None):
+    path = manifest_path(output_dir)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (ValueError, OSError):
+        return {}
+
+
+def save_manifest(manifest, output_dir=None):
+    path = manifest_path(output_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    tmp.replace(path)
+
+
+def extras_path(key):
+    return FIGURE_CACHE_DIR / f"{key}.pkl"
+
+
+def lookup(manifest, job, key):
+    entry = manifest.get(job_id(job))
+    if entry is None or entry["key"] != key:
+        return None
+    if not all(Path(f).exists() for f in entry["files"]) or not extras_path(key).exists():
+        return None
+    try:
+        with open(extras_path(key), "rb") as f:
+            extras = pickle.load(f)
+    except Exception:
+        return None
+    entry["used"] = time.time()
+    return {"saved": [Path(f) for f in entry["files"]], "errors": [], "extras": extras}
+
+
+def _remove_files(paths):
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+def record(manifest, job, key, outcome):
+    previous = manifest.get(job_id(job))
+    files = [str(p) for p in outcome["saved"]]
+    if previous is not None:
+        _remove_files(set(previous["files"]) - set(files))
+        if previous["key"] != key:
+            extras_path(previous["key"]).unlink(missing_ok=True)
+
+    FIGURE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(extras_path(key), "wb") as f:
+        pickle.dump(outcome["extras"], f)
+    manifest[job_id(job)] = {"key": key, "files": files, "used": time.time()}
+
+
+def evict_stale(manifest, max_age_days=None):
+    limit = FIGURE_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    cutoff = time.time() - limit * 86400
+    stale = [jid for jid, entry in manifest.items() if entry["used"] < cutoff]
+    for jid in stale:
+        entry = manifest.pop(jid)
+        _remove_files(entry["files"])
+        extras_path(entry["key"]).unlink(missing_ok=True)
+    return stale
+
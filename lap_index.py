@@ -0,0 +1,79 @@
+from itertools import combinations
+import pandas as pd
+
+INDEX_KEYS = ["Year", "Test", "Day", "Team", "Driver", "Compound"]
+
+
+def _valid_laps(laps):
+    valid = laps.dropna(subset=["LapTimeSeconds"])
+    valid = valid[valid["LapTimeSeconds"] > 0]
+    if "Deleted" in valid.columns:
+        valid = valid[valid["Deleted"] != True]
+    return valid
+
+
+def _normalise(value):
+    return None if pd.isna(value) else value
+
+
+def build_lap_index(laps):
+    valid = _valid_laps(laps)
+    keys = [k for k in INDEX_KEYS if k in valid.columns]
+    if valid.empty:
+        return {"keys": keys, "best": valid.copy(), "lookup": {}}
+
+    best_idx = valid.groupby(keys, dropna=False, sort=False)["LapTimeSeconds"].idxmin()
+    best = pd.DataFrame(valid.loc[best_idx.values]).reset_index(drop=True)
+
+    lookup = {(): {(): best["LapTimeSeconds"].idxmin()}}
+    for size in range(1, len(keys) + 1):
+        for subset in combinations(keys, size):
+            grouped = best.groupby(list(subset), dropna=False, sort=False)["LapTimeSeconds"].idxmin()
+            values = grouped.index if size > 1 else [(v,) for v in grouped.index]
+            lookup[subset] = {
+                tuple(_normalise(v) for v in value): label
+                for value, label in zip(values, grouped.values)
+            }
+
+    return {"keys": keys, "best": best, "lookup": lookup}
+
+
+def _selection_key(index, selection):
+    subset = tuple(k for k in index["keys"] if selection.get(k) is not None)
+    unknown = set(k for k, v in selection.items() if v is not None) - set(subset)
+    if unknown:
+        raise KeyError(f"Unknown lap index keys: {sorted(unknown)}")
+    return subset, tuple(selection[k] for k in subset)
+
+
+def best_lap_record(index, **selection):
+    subset, values = _selection_key(index, selection)
+    label = index["lookup"].get(subset, {}).get(values)
+    if label is None:
+        return None
+    return index["best"].loc[label]
+
+
+def best_lap_records(index, by, **selection):
+    by = [by] if isinstance(by, str) else list(by)
+    subset, values = _selection_key(index, selection)
+    group_keys = tuple(k for k in index["keys"] if k in subset or k in by)
+    positions = [group_keys.index(k) for k in subset]
+
+    labels = [
+        label for key, label in index["lookup"].get(group_keys, {}).items()
+        if tuple(key[p] for p in positions) == values
+    ]
+    return index["best"].loc[labels].sort_values("LapTimeSeconds")
+
+
+def resolve_lap(record):
+    from data_loader import get_session, load_session
+
+    if record is None:
+        return None
+    key = (record["Year"], record["Test"], record["Day"])
+    session = get_session(*key)
+    if session is None:
+        session = load_session(*key)
+    return session.laps.loc[record["SessionLapIndex"]]
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from config import LAP_SEARCH_POINTS, LAP_SEARCH_BLOCK, LAP_SEARCH_COMPONENTS, TELEMETRY_CHANNELS
+from telemetry_cache import list_cache_entries
+from resample import resample_packed
+
+SPEED_ROW = TELEMETRY_CHANNELS.index("Speed")
+
+
+def load_cached_speed(paths):
+    distance, speed, lengths = [], [], []
+    for path in paths:
+        array = np.load(path, mmap_mode="r")
+        d = np.asarray(array[0], dtype=float)
+        keep = ~np.isnan(d) & ~np.isnan(array[SPEED_ROW])
+        d = d[keep]
+        distance.append(d / d[-1] if len(d) and d[-1] > 0 else d)
+        speed.append(np.asarray(array[SPEED_ROW], dtype=float)[keep])
+        lengths.append(len(d))
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(int)
+    if not lengths:
+        return np.empty(0), np.empty((1, 0)), offsets
+    return np.concatenate(distance), np.concatenate(speed)[None, :], offsets
+
+
+def normalise_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def fit_components(centred, n_components):
+    _, _, vt = np.linalg.svd(centred, full_matrices=False)
+    return vt[:n_components]
+
+
+def lap_teams(keys, laps):
+    years = keys["Session"].str.split("_").str[0].astype(int)
+    teams = laps.drop_duplicates(["Year", "Driver"]).set_index(["Year", "Driver"])["Team"]
+    team = pd.Series(teams.reindex(pd.MultiIndex.from_arrays([years, keys["Driver"]])).values, index=keys.index)
+    missing = team.isna()
+    if missing.any():
+        print(f"  Warning: no team for {missing.sum()} indexed laps; they are only excluded against their own driver")
+    return team
+
+
+def build_search_index(laps, entries=None, cache_dir=None, n_points=None, n_components=None):
+    if entries is None:
+        entries = list_cache_entries(cache_dir)
+    entries = entries.sort_values(["Session", "Driver", "LapNumber"]).reset_index(drop=True)
+
+    grid = np.linspace(0.0, 1.0, n_points or LAP_SEARCH_POINTS)
+    distance, speed, offsets = load_cached_speed(entries["Path"])
+    traces = resample_packed(distance, speed, offsets, grid)[:, 0]
+
+    valid = ~np.isnan(traces).any(axis=1)
+    keys = entries.loc[valid, ["Session", "Driver", "LapNumber"]].reset_index(drop=True)
+    keys["Team"] = lap_teams(keys, laps)
+    traces = traces[valid]
+
+    mean = traces.mean(axis=0) if len(traces) else np.zeros(len(grid))
+    centred = traces - mean
+    n_components = LAP_SEARCH_COMPONENTS if n_components is None else n_components
+    components = None
+    if n_components and len(traces) > n_components:
+        components = fit_components(centred, n_components)
+        centred = centred @ components.T
+
+    return {
+        "keys": keys,
+        "vectors": normalise_rows(centred).astype(np.float32),
+        "mean": mean,
+        "components": components,
+        "grid": grid,
+        "top_speed": traces.max(axis=1) if len(traces) else np.empty(0),
+    }
+
+
+def fingerprint(index, speed, distance):
+    distance = np.asarray(distance, dtype=float)
+    trace = np.interp(index["grid"], distance / distance[-1], np.asarray(speed, dtype=float))
+    vector = trace - index["mean"]
+    if index["components"] is not None:
+        vector = index["components"] @ vector
+    return normalise_rows(vector[None, :]).astype(np.float32)
+
+
+def block_top_k(sims, k):
+    if k > 16:
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        return top, np.take_along_axis(sims, top, axis=1)
+
+    rows = np.arange(len(sims))
+    top = np.empty((len(sims), k), dtype=int)
+    values = np.empty((len(sims), k), dtype=sims.dtype)
+    for i in range(k):
+        top[:, i] = sims.argmax(axis=1)
+        values[:, i] = sims[rows, top[:, i]]
+        sims[rows, top[:, i]] = -np.inf
+    return top, values
+
+
+def top_k_similar(queries, vectors, k, block=None, exclude=None):
+    k = min(k, len(vectors))
+    block = block or LAP_SEARCH_BLOCK
+    best_idx = np.zeros((len(queries), 0), dtype=int)
+    best_sim = np.zeros((len(queries), 0), dtype=np.float32)
+
+    for start in range(0, len(vectors), block):
+        stop = min(start + block, len(vectors))
+        sims = queries @ vectors[start:stop].T
+        if exclude is not None:
+            sims[exclude(start, stop)] = -np.inf
+        top, values = block_top_k(sims, min(k, stop - start))
+        best_idx = np.concatenate([best_idx, top + start], axis=1)
+        best_sim = np.concatenate([best_sim, values], axis=1)
+        if best_sim.shape[1] > k:
+            top, best_sim = block_top_k(best_sim, k)
+            best_idx = np.take_along_axis(best_idx, top, axis=1)
+
+    order = np.argsort(-best_sim, axis=1)
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_sim, order, axis=1)
+
+
+def query_exclusion(index, positions, other_teams=True):
+    if not other_teams:
+        return lambda start, stop: positions[:, None] == np.arange(start, stop)[None, :]
+    keys = index["keys"]
+    teams = pd.factorize(keys["Team"].fillna(keys["Session"] + "/" + keys["Driver"]))[0]
+    query_teams = teams[positions]
+    return lambda start, stop: query_teams[:, None] == teams[None, start:stop]
+
+
+def neighbours_table(index, positions, idx, sims):
+    keys = index["keys"]
+    query = keys.iloc[np.repeat(positions, idx.shape[1])].reset_index(drop=True)
+    match = keys.iloc[idx.ravel()].reset_index(drop=True).add_prefix("Match")
+    table = pd.concat([query, match], axis=1)
+    table["Rank"] = np.tile(np.arange(1, idx.shape[1] + 1), len(positions))
+    table["Similarity"] = sims.ravel()
+    table["TopSpeedDelta"] = index["top_speed"][idx.ravel()] - np.repeat(index["top_speed"][positions], idx.shape[1])
+    return table[np.isfinite(table["Similarity"])].reset_index(drop=True)
+
+
+def find_similar_laps(index, positions=None, k=5, other_teams=True, block=None):
+    positions = np.arange(len(index["keys"])) if positions is None else np.atleast_1d(positions)
+    exclude = query_exclusion(index, positions, other_teams)
+    idx, sims = top_k_similar(index["vectors"][positions], index["vectors"], k, block, exclude)
+    return neighbours_table(index, positions, idx, sims)
+
+
+def lap_position(index, session, driver, lap_number):
+    keys = index["keys"]
+    match = np.flatnonzero(
+        (keys["Session"] == session) & (keys["Driver"] == str(driver)) & (keys["LapNumber"] == int(lap_number))
+    )
+    if not len(match):
+        raise KeyError(f"No indexed lap for {driver} lap {lap_number} in {session}")
+    return int(match[0])
+
+
+def search_like(index, tel, k=5, block=None):
+    query = fingerprint(index, tel["Speed"].values, tel["Distance"].values)
+    idx, sims = top_k_similar(query, index["vectors"], k, block)
+    table = index["keys"].iloc[idx[0]].reset_index(drop=True)
+    table["Similarity"] = sims[0]
+    return table
@@ -0,0 +1,66 @@
+import argparse
+import importlib
+import importlib.util
+import re
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class LazyModule(types.ModuleType):
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
+
+
+def profile_imports(target, top=15):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, cwd=REPO_DIR,
+    )
+    total = 0.0
+    packages = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        if not indent.strip(" ") and len(indent) <= 1:
+            total += int(cumulative_us) / 1e6
+        package = name.partition(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+    return total, sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def print_import_profile(target, top=15):
+    total, packages = profile_imports(target, top)
+    print(f"import {target}: {total:.2f}s")
+    for package, seconds in packages:
+        print(f"  {package:<30} {seconds:7.3f}s")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Import-time profile of an entry point")
+    parser.add_argument("targets", nargs="*", default=["run_analysis", "run_analysis_pt2"])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for target in args.targets:
+        print_import_profile(target, args.top)
+
+
+if __name__ == "__main__":
+    run()
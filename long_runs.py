@@ -1,12 +1,14 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from lazy_imports import lazy_import
 from config import LONG_RUN_MIN_LAPS
 from plotting import (
     apply_theme, create_figure, build_color_maps,
     get_compound_color, add_watermark, save_figure,
 )
 
+plt = lazy_import("matplotlib.pyplot")
+
 
 def identify_long_runs(laps, min_laps=None):
     threshold = min_laps or LONG_RUN_MIN_LAPS
@@ -187,8 +189,9 @@ def plot_long_runs_by_compound(laps, long_runs):
     return fig
 
 
-def generate_all(laps):
-    long_runs = identify_long_runs(laps)
+def generate_all(laps, long_runs=None):
+    if long_runs is None:
+        long_runs = identify_long_runs(laps)
     figures = {}
     figures["long_run_traces"] = plot_long_run_traces(laps, long_runs)
     figures["consistency_rankings"] = plot_consistency_rankings(long_runs)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
+from config import MINISECTORS, TEAM_COLORS, FALLBACK_COLOR
+from plotting import apply_theme, create_figure, add_watermark, plot_telemetry
+from resample import step_times
+
+
+def minisector_starts(n_points, n_minisectors):
+    n = min(n_minisectors, n_points - 1)
+    return np.unique(np.linspace(0, n_points - 1, n + 1).astype(int)[:-1])
+
+
+def compute_minisectors(speed, grid, labels, n_minisectors=None):
+    starts = minisector_starts(len(grid), n_minisectors or MINISECTORS)
+    ends = np.append(starts[1:], len(grid) - 1)
+
+    counts = np.diff(np.append(starts, len(grid)))
+    mean_speed = np.add.reduceat(speed, starts, axis=1) / counts
+    times = np.add.reduceat(step_times(speed, grid), starts, axis=1)
+
+    fastest = times.argmin(axis=0)
+    ordered = np.sort(times, axis=0)
+    margin = ordered[1] - ordered[0] if len(labels) > 1 else np.zeros(len(starts))
+
+    labels = np.asarray(labels)
+    summary = pd.DataFrame({
+        "Minisector": np.arange(1, len(starts) + 1),
+        "Start": grid[starts],
+        "End": grid[ends],
+        "Fastest": labels[fastest],
+        "FastestTime": ordered[0],
+        "Margin": margin,
+        "FastestMeanSpeed": mean_speed[fastest, np.arange(len(starts))],
+    })
+    sector_times = pd.DataFrame(times, index=pd.Index(labels, name="Team"),
+                                columns=summary["Minisector"])
+    return summary, sector_times
+
+
+def count_minisectors_won(summary):
+    return summary["Fastest"].value_counts().rename_axis("Team").reset_index(name="Minisectors")
+
+
+def plot_minisector_strip(summary, speed=None, grid=None, labels=None):
+    apply_theme()
+
+    if summary.empty:
+        return None
+
+    fig, axes = plt.subplots(
+        2, 1, figsize=(16, 7), gridspec_kw={"height_ratios": [1, 4]},
+    )
+    fig.set_facecolor("white")
+
+    colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in summary["Fastest"]]
+    axes[0].barh(
+        0, summary["End"] - summary["Start"], left=summary["Start"],
+        color=colors, edgecolor="white", linewidth=0.5, height=1.0,
+    )
+    axes[0].set_yticks([])
+    axes[0].set_xlim(summary["Start"].min(), summary["End"].max())
+    axes[0].set_title("Fastest Team per Minisector")
+    axes[0].grid(False)
+
+    teams = sorted(summary["Fastest"].unique())
+    handles = [mpatches.Patch(facecolor=TEAM_COLORS.get(t, FALLBACK_COLOR), label=t) for t in teams]
+    axes[0].legend(handles=handles, loc="upper center", bbox_to_anchor=(0.5, -0.25),
+                   ncol=min(len(teams), 6), fontsize=9)
+
+    if speed is not None:
+        plot_telemetry(axes[1], [
+            (grid, row, dict(color=TEAM_COLORS.get(label, FALLBACK_COLOR), linewidth=1.0, alpha=0.7))
+            for row, label in zip(speed, labels)
+        ])
+        for start in summary["Start"]:
+            axes[1].axvline(x=start, color="#DDDDDD", linewidth=0.5, zorder=0)
+        axes[1].set_xlim(summary["Start"].min(), summary["End"].max())
+        axes[1].set_ylabel("Speed (km/h)")
+    axes[1].set_xlabel("Distance (m)")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def plot_minisectors_won(summary):
+    apply_theme()
+
+    won = count_minisectors_won(summary)
+    if won.empty:
+        return None
+
+    fig, ax = create_figure(width=12, height=7)
+    colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in won["Team"]]
+    ax.barh(won["Team"], won["Minisectors"], color=colors, edgecolor="white")
+    ax.set_xlabel("Minisectors Won")
+    ax.set_title(f"Minisector Dominance ({len(summary)} minisectors, team best laps)")
+    ax.invert_yaxis()
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(lap_index, compound=None):
+    from speed_traces import load_team_best_laps
+
+    figures = {}
+    records, batch, grid, channels = load_team_best_laps(lap_index, compound=compound)
+    if records.empty:
+        return figures, pd.DataFrame()
+
+    speed = batch[:, channels.index("Speed")]
+    summary, _ = compute_minisectors(speed, grid, records["Team"].values)
+
+    figures["strip"] = plot_minisector_strip(summary, speed, grid, records["Team"].values)
+    figures["won"] = plot_minisectors_won(summary)
+    return figures, summary
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import matplotlib.colors as mcolors
+from config import PAIRWISE_MEMORY_BYTES, PAIRWISE_SEGMENTS
+from plotting import apply_theme, create_figure, add_watermark
+from resample import step_times
+from minisectors import minisector_starts
+
+
+def chunk_rows(n_laps, n_points, max_bytes=None, itemsize=8):
+    per_row = max(n_laps * n_points * itemsize, 1)
+    return int(np.clip((max_bytes or PAIRWISE_MEMORY_BYTES) // per_row, 1, max(n_laps, 1)))
+
+
+def iter_speed_deltas(speed, max_bytes=None):
+    rows = chunk_rows(len(speed), speed.shape[1], max_bytes, speed.itemsize)
+    for start in range(0, len(speed), rows):
+        stop = min(start + rows, len(speed))
+        yield start, stop, speed[start:stop, None, :] - speed[None, :, :]
+
+
+def segment_times(speed, grid, n_segments=None):
+    starts = minisector_starts(len(grid), n_segments or PAIRWISE_SEGMENTS)
+    return np.add.reduceat(step_times(speed, grid), starts, axis=1), grid[starts]
+
+
+def pairwise_summary(speed, grid, labels, n_segments=None, max_bytes=None):
+    n = len(speed)
+    mean_delta = np.empty((n, n))
+    faster_share = np.empty((n, n))
+    max_gain = np.empty((n, n))
+    for start, stop, delta in iter_speed_deltas(speed, max_bytes):
+        mean_delta[start:stop] = delta.mean(axis=2)
+        faster_share[start:stop] = (delta > 0).mean(axis=2)
+        max_gain[start:stop] = delta.max(axis=2)
+
+    seg_times, seg_starts = segment_times(speed, grid, n_segments)
+    lap_times = seg_times.sum(axis=1)
+    top_speed = np.nanmax(speed, axis=1)
+
+    return {
+        "labels": list(labels),
+        "segment_starts": seg_starts,
+        "time_gained": lap_times[None, :] - lap_times[:, None],
+        "segment_gained": seg_times[None, :, :] - seg_times[:, None, :],
+        "top_speed_delta": top_speed[:, None] - top_speed[None, :],
+        "mean_speed_delta": mean_delta,
+        "faster_share": faster_share,
+        "max_speed_gain": max_gain,
+    }
+
+
+def summary_matrix(summary, key):
+    labels = pd.Index(summary["labels"], name="Team")
+    return pd.DataFrame(summary[key], index=labels, columns=labels.rename("Opponent"))
+
+
+def pair_table(summary):
+    labels = np.asarray(summary["labels"])
+    i, j = np.nonzero(~np.eye(len(labels), dtype=bool))
+    table = pd.DataFrame({"Team": labels[i], "Opponent": labels[j]})
+    for key in ["time_gained", "top_speed_delta", "mean_speed_delta", "faster_share", "max_speed_gain"]:
+        table[key] = summary[key][i, j]
+    best = summary["segment_gained"][i, j].argmax(axis=1)
+    table["BestSegment"] = best + 1
+    table["BestSegmentGain"] = summary["segment_gained"][i, j, best]
+    return table.sort_values(["Team", "time_gained"], ascending=[True, False]).reset_index(drop=True)
+
+
+def plot_pairwise_heatmap(summary, key, title, label, fmt="{:+.2f}"):
+    apply_theme()
+
+    matrix = summary_matrix(summary, key)
+    if matrix.empty:
+        return None
+
+    order = summary_matrix(summary, "time_gained").mean(axis=1).sort_values(ascending=False).index
+    matrix = matrix.loc[order, order]
+    values = matrix.values.astype(float)
+    np.fill_diagonal(values, np.nan)
+
+    fig, ax = create_figure(width=13, height=11)
+    center = 0.5 if key == "faster_share" else 0.0
+    limit = np.nanmax(np.abs(values - center)) if np.isfinite(values).any() else 1.0
+    cmap = mcolors.LinearSegmentedColormap.from_list("", ["#2166AC", "#F5F5F5", "#B2182B"])
+    im = ax.imshow(values, cmap=cmap, vmin=center - limit, vmax=center + limit)
+
+    ax.set_xticks(range(len(order)))
+    ax.set_xticklabels(order, rotation=45, ha="right")
+    ax.set_yticks(range(len(order)))
+    ax.set_yticklabels(order)
+    ax.grid(False)
+
+    for i in range(len(order)):
+        for j in range(len(order)):
+            if i != j and np.isfinite(values[i, j]):
+                ax.text(j, i, fmt.format(values[i, j]), ha="center", va="center", fontsize=8, color="#333333")
+
+    fig.colorbar(im, ax=ax, shrink=0.8, label=label)
+    ax.set_xlabel("Opponent")
+    ax.set_ylabel("Team")
+    ax.set_title(title)
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(lap_index, compound=None):
+    from speed_traces import load_team_best_laps
+
+    figures = {}
+    records, batch, grid, channels = load_team_best_laps(lap_index, compound=compound, channels=["Speed"])
+    if len(records) < 2:
+        return figures, pd.DataFrame()
+
+    summary = pairwise_summary(batch[:, 0], grid, records["Team"].values)
+    figures["time_gained"] = plot_pairwise_heatmap(
+        summary, "time_gained", "Pairwise Lap Time Gained (team best laps)",
+        "Time Gained by Team over Opponent (s)",
+    )
+    figures["faster_share"] = plot_pairwise_heatmap(
+        summary, "faster_share", "Share of Lap Faster than Opponent",
+        "Fraction of Distance Faster", fmt="{:.0%}",
+    )
+    figures["top_speed"] = plot_pairwise_heatmap(
+        summary, "top_speed_delta", "Pairwise Top Speed Delta",
+        "Top Speed Difference (km/h)", fmt="{:+.1f}",
+    )
+    return figures, pair_table(summary)
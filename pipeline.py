@@ -0,0 +1,374 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+import pandas as pd
+from config import PIPELINE_WORKERS
+from profiling import profile_stage
+
+
+def stage(func, *inputs, main_thread=False, render=False):
+    return {"func": func, "inputs": list(inputs), "main_thread": main_thread or render, "render": render}
+
+
+def required_stages(stages, targets):
+    needed, visiting = [], set()
+
+    def visit(name):
+        if name in needed:
+            return
+        if name not in stages:
+            raise KeyError(f"Unknown pipeline stage: {name}")
+        if name in visiting:
+            raise ValueError(f"Pipeline cycle through stage: {name}")
+        visiting.add(name)
+        for dep in stages[name]["inputs"]:
+            visit(dep)
+        visiting.discard(name)
+        needed.append(name)
+
+    for target in targets:
+        visit(target)
+    return needed
+
+
+def _timed(name, func, args):
+    start = time.perf_counter()
+    with profile_stage(name, "pipeline"):
+        value = func(*args)
+    return value, time.perf_counter() - start
+
+
+def _render_batch(stages, names, values):
+    from render import render_jobs, report
+
+    start = time.perf_counter()
+    jobs, results = {}, {}
+    for name in names:
+        try:
+            jobs[name] = _timed(name, stages[name]["func"], [values[dep] for dep in stages[name]["inputs"]])[0]
+        except Exception as exc:
+            results[name] = exc
+    batch = [job for name in jobs for job in jobs[name]]
+    try:
+        with profile_stage(f"render ({len(batch)} jobs)", "pipeline"):
+            outcomes = render_jobs(batch)
+    except Exception as exc:
+        return {name: results.get(name, exc) for name in names}, time.perf_counter() - start
+
+    report(batch, outcomes, PRINTERS)
+    for name in jobs:
+        results[name], outcomes = outcomes[:len(jobs[name])], outcomes[len(jobs[name]):]
+    return results, time.perf_counter() - start
+
+
+def _batch_result(result, seconds):
+    if isinstance(result, Exception):
+        raise result
+    return result, seconds
+
+
+def run_pipeline(stages, targets, max_workers=None, values=None, verbose=True):
+    values = dict(values or {})
+    order = [name for name in required_stages(stages, targets) if name not in values]
+    pending = list(order)
+    status, timings = {}, {}
+    futures = {}
+
+    def finish(name, outcome):
+        try:
+            values[name], timings[name] = outcome()
+            status[name] = "done"
+        except Exception as exc:
+            status[name] = f"failed: {type(exc).__name__}: {exc}"
+            timings[name] = float("nan")
+        if verbose:
+            print(f"  [{status[name].split(':')[0]}] {name} ({timings[name]:.2f}s)")
+
+    with ThreadPoolExecutor(max_workers=max_workers or PIPELINE_WORKERS) as pool:
+        while pending or futures:
+            for name in list(pending):
+                inputs = stages[name]["inputs"]
+                if any(status.get(dep, "").startswith(("failed", "skipped")) for dep in inputs):
+                    status[name], timings[name] = "skipped", float("nan")
+                    pending.remove(name)
+                elif all(dep in values for dep in inputs) and not stages[name]["main_thread"]:
+                    args = [values[dep] for dep in inputs]
+                    futures[pool.submit(_timed, name, stages[name]["func"], args)] = name
+                    pending.remove(name)
+
+            ready_main = [
+                name for name in pending
+                if stages[name]["main_thread"] and all(dep in values for dep in stages[name]["inputs"])
+            ]
+            renders = [name for name in ready_main if stages[name]["render"]]
+            others = [name for name in ready_main if not stages[name]["render"]]
+            if others:
+                name = others[0]
+                pending.remove(name)
+                args = [values[dep] for dep in stages[name]["inputs"]]
+                finish(name, partial(_timed, name, stages[name]["func"], args))
+                continue
+            if renders and not futures:
+                for name in renders:
+                    pending.remove(name)
+                results, seconds = _render_batch(stages, renders, values)
+                for name in renders:
+                    finish(name, partial(_batch_result, results[name], seconds))
+                continue
+
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(futures.pop(future), future.result)
+
+    report = pd.DataFrame({
+        "Stage": order,
+        "Status": [status.get(name, "skipped") for name in order],
+        "Seconds": [timings.get(name, float("nan")) for name in order],
+    })
+    return values, report
+
+
+PACE_COLUMNS = ["Team", "MeanLongRunPace", "DeltaToLeader", "TestingRank", "NumLongRuns"]
+
+
+def print_programmes(prog_stints):
+    if not prog_stints.empty:
+        print(prog_stints.groupby(["Team", "Programme"]).size().unstack(fill_value=0).to_string())
+
+
+def print_delta_check(dt_check):
+    if not dt_check.empty:
+        print(dt_check[["Label", "ActualDelta", "IntegratedDelta", "DeltaError"]].to_string(index=False))
+
+
+def print_deployment(dep_summary):
+    if not dep_summary.empty:
+        print(dep_summary.round(1).to_string(index=False))
+
+
+def print_calibration(pace_2025, pace_w2, comparison):
+    print("\n  2026 Week 2 Long Run Pace:")
+    print(pace_w2[PACE_COLUMNS].to_string(index=False))
+
+
+def print_week_calibration(pace_w1, pace_w2_cal, week_comp):
+    print("\n  Week 1 Long Run Pace:")
+    print(pace_w1[PACE_COLUMNS].to_string(index=False))
+
+    print("\n  Week 2 Long Run Pace:")
+    print(pace_w2_cal[PACE_COLUMNS].to_string(index=False))
+
+    if not week_comp.empty:
+        from calibration import baseline_year_of
+        print("\n  Week Comparison Table:")
+        display_cols = [
+            "Team_2026", f"WCC_Finish_{baseline_year_of(week_comp)}",
+            "Testing_Delta_W1", "Testing_Rank_W1",
+            "Testing_Delta_W2", "Testing_Rank_W2",
+        ]
+        available = [c for c in display_cols if c in week_comp.columns]
+        print(week_comp[available].to_string(index=False))
+
+
+def print_bootstrap(boot_summary):
+    if not boot_summary.empty:
+        print("\n  Week 2 Rank Probabilities:")
+        print(boot_summary[["Team", "NumLongRuns", "ProbFastest", "ExpectedRank", "DeltaLow", "DeltaHigh"]].to_string(index=False))
+
+
+PRINTERS = {
+    ("programmes", "generate_all"): print_programmes,
+    ("speed_traces", "generate_delta_time"): print_delta_check,
+    ("deployment", "generate_all"): print_deployment,
+    ("calibration", "generate_all"): print_calibration,
+    ("calibration", "generate_week_comparison"): print_week_calibration,
+    ("bootstrap", "generate_all"): print_bootstrap,
+}
+
+
+def _load(loader):
+    _, laps = loader()
+    return laps
+
+
+def _stats_cube(**weeks):
+    from distributions import compute_team_stats
+
+    frames = [compute_team_stats(clean).assign(Week=label) for label, clean in weeks.items()]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _figure_jobs(title, module, function, prefix, *args, local=False, fmt=None):
+    from render import figure_job
+
+    return [figure_job(title, module, function, *args, prefix=prefix, local=local, fmt=fmt)]
+
+
+def table_jobs(title, prefix, plots, tables, fmt=None):
+    from render import figure_job
+
+    return [
+        figure_job(title, "calibration", function, *[tables[i] for i in table_args],
+                   prefix=f"{prefix}_{name}", fmt=fmt)
+        for name, function, table_args in plots
+        if not any(tables[i].empty for i in table_args)
+    ]
+
+
+def _table_jobs(title, prefix, plots, *tables, fmt=None):
+    return table_jobs(title, prefix, plots, tables, fmt)
+
+
+def _figure(title, module, function, prefix, *inputs, local=False, fmt=None):
+    return stage(partial(_figure_jobs, title, module, function, prefix, local=local, fmt=fmt), *inputs, render=True)
+
+
+WEEKS = {"w1": ("Week 1", "load_2026_w1"), "w2": ("Week 2", "load_2026_w2")}
+
+WEEK_FIGURES = [
+    ("reliability", "Module 1: Reliability & Program Maturity", "reliability", "generate_all", ("laps",), False),
+    ("distributions", "Module 2: Lap Time Distributions", "distributions", "generate_all", ("clean",), False),
+    ("long_runs", "Module 3: Long Run Consistency", "long_runs", "generate_all", ("clean", "long_runs"), False),
+    ("programmes", "Module 3c: Run Programmes", "programmes", "generate_all", ("clean",), False),
+    ("minisectors", "Module 4b: Minisector Dominance", "minisectors", "generate_all", ("index",), True),
+    ("delta_time", "Module 4c: Delta Time", "speed_traces", "generate_delta_time", ("index",), True),
+    ("braking", "Module 4d: Braking Signatures", "braking", "generate_all", ("index",), True),
+    ("deployment", "Module 4e: ERS Deployment", "deployment", "generate_all", ("clean",), True),
+    ("pairwise", "Module 4f: Pairwise Speed Deltas", "pairwise", "generate_all", ("index",), True),
+    ("bootstrap", "Module 5c: Long Run Rank Bootstrap", "bootstrap", "generate_all", ("clean", "long_runs"), False),
+]
+
+WEEK_COMPARISONS = [
+    ("reliability", "Module 1b: Reliability Week-over-Week", "reliability", "laps"),
+    ("distributions", "Module 2b: Distributions Week-over-Week", "distributions", "clean"),
+    ("long_runs", "Module 3b: Long Runs Week-over-Week", "long_runs", "clean"),
+]
+
+CALIBRATION_PLOTS = [
+    ("bump_chart", "plot_bump_chart", [0]),
+    ("delta_comparison", "plot_delta_comparison", [1]),
+    ("shift_analysis", "plot_shift_analysis", [1]),
+]
+
+CALIBRATION_WEEK_PLOTS = [
+    ("week_trajectory", "plot_week_trajectory", [0]),
+    ("delta_comparison_weeks", "plot_delta_comparison_weeks", [0]),
+]
+
+
+def analysis_stages(baseline_year=None, baseline_test=None, fmt=None):
+    import data_loader
+    from config import BASELINE_YEAR, BASELINE_TEST_NUMBER, BASELINE_TEST_DAYS
+    from lap_index import build_lap_index
+    from long_runs import identify_long_runs
+    from export import compute_week_tables
+    from calibration import (
+        compute_long_run_pace, build_calibration_table, build_comparison_table, build_week_comparison_table,
+    )
+
+    baseline_year = baseline_year or BASELINE_YEAR
+    baseline_test = baseline_test or BASELINE_TEST_NUMBER
+    loaders = {week: getattr(data_loader, loader) for week, (_, loader) in WEEKS.items()}
+    loaders["base"] = partial(data_loader.load_test, baseline_year, baseline_test, BASELINE_TEST_DAYS)
+
+    stages = {}
+    for week, loader in loaders.items():
+        stages[f"laps_{week}"] = stage(partial(_load, loader))
+        stages[f"clean_{week}"] = stage(data_loader.get_clean_laps, f"laps_{week}")
+        stages[f"index_{week}"] = stage(build_lap_index, f"laps_{week}")
+        stages[f"long_runs_{week}"] = stage(identify_long_runs, f"clean_{week}")
+        stages[f"pace_{week}"] = stage(
+            lambda clean, runs: compute_long_run_pace(clean, long_runs=runs),
+            f"clean_{week}", f"long_runs_{week}",
+        )
+        stages[f"tables_{week}"] = stage(
+            compute_week_tables, f"laps_{week}", f"clean_{week}", f"long_runs_{week}", f"pace_{week}",
+        )
+
+    stages["stats_cube"] = stage(
+        lambda w1, w2, base: _stats_cube(w1=w1, w2=w2, **{str(baseline_year): base}),
+        "clean_w1", "clean_w2", "clean_base",
+    )
+    stages["calibration_table"] = stage(partial(build_calibration_table, baseline_year=baseline_year), "pace_base")
+    stages["week_comparison"] = stage(
+        partial(build_week_comparison_table, baseline_year=baseline_year), "pace_base", "pace_w1", "pace_w2",
+    )
+
+    for week, (label, _) in WEEKS.items():
+        stages[f"comparison_{week}"] = stage(
+            partial(build_comparison_table, baseline_year=baseline_year), "pace_base", f"pace_{week}",
+        )
+        for key, title, module, function, kinds, local in WEEK_FIGURES:
+            stages[f"fig_{key}_{week}"] = _figure(f"{title} ({label})", module, function, f"{week}_{key}",
+                                                  *[f"{kind}_{week}" for kind in kinds], local=local, fmt=fmt)
+        stages[f"fig_speed_traces_{week}"] = _figure(
+            f"Module 4: Speed Traces (2026 {label} vs {baseline_year})", "speed_traces", "generate_speed_traces",
+            f"{week}_speed_traces", f"index_{week}", "index_base", local=True, fmt=fmt,
+        )
+        stages[f"fig_calibration_{week}"] = stage(
+            partial(_table_jobs, f"Module 5: Calibration ({label} standalone)", f"{week}_calibration",
+                    CALIBRATION_PLOTS, fmt=fmt),
+            "calibration_table", f"comparison_{week}", render=True,
+        )
+
+    for key, title, module, kind in WEEK_COMPARISONS:
+        stages[f"fig_{key}_weeks"] = _figure(title, module, "generate_week_comparison", f"compare_{key}",
+                                             f"{kind}_w1", f"{kind}_w2", fmt=fmt)
+    stages["fig_calibration_weeks"] = stage(
+        partial(_table_jobs, "Module 5b: Calibration Week-over-Week", "compare_calibration",
+                CALIBRATION_WEEK_PLOTS, fmt=fmt),
+        "week_comparison", render=True,
+    )
+    return stages
+
+
+TARGET_GROUPS = {
+    "tables": ["stats_cube", "calibration_table", "comparison_w2", "week_comparison"],
+    "data": ["clean_w1", "clean_w2", "clean_base", "index_w2", "index_base"],
+}
+
+
+def expand_targets(stages, targets):
+    expanded = []
+    for target in targets:
+        if target == "figures":
+            expanded += [name for name in stages if name.startswith("fig_")]
+        elif target == "all":
+            expanded += list(stages)
+        else:
+            expanded += TARGET_GROUPS.get(target, [target])
+    return list(dict.fromkeys(expanded))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Build selected analysis stages and their dependencies")
+    parser.add_argument("targets", nargs="*", default=["figures"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    stages = analysis_stages()
+    if args.list:
+        for name, spec in stages.items():
+            print(f"{name:<26} <- {', '.join(spec['inputs']) or '-'}")
+        return
+
+    from config import OUTPUT_DIR
+    from data_loader import setup, retain_sessions
+    from plotting import apply_theme
+
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    setup(offline=args.offline)
+    apply_theme()
+
+    with retain_sessions():
+        _, report = run_pipeline(stages, expand_targets(stages, args.targets), max_workers=args.workers)
+    print(f"\n{report.to_string(index=False)}")
+
+
+if __name__ == "__main__":
+    run()
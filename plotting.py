@@ -1,13 +1,16 @@
 import colorsys
-import matplotlib.pyplot as plt
-import matplotlib as mpl
 import numpy as np
+from lazy_imports import lazy_import
 from config import (
     TEAM_COLORS, COMPOUND_COLORS, FALLBACK_COLOR,
     FIGURE_DPI, FIGURE_WIDTH, FIGURE_HEIGHT,
+    TELEMETRY_DECIMATION, DECIMATION_POINTS_PER_PIXEL,
     TITLE_SIZE, LABEL_SIZE, TICK_SIZE,
 )
 
+plt = lazy_import("matplotlib.pyplot")
+mpl = lazy_import("matplotlib")
+
 
 def apply_theme():
     mpl.rcParams.update({
@@ -101,6 +104,130 @@ def add_watermark(fig, text="@formulasteele"):
     )
 
 
+def pad_series(series):
+    lengths = np.array([len(x) for x, _ in series])
+    width = max(lengths.max(), 1)
+    xs = np.full((len(series), width), np.nan)
+    ys = np.full((len(series), width), np.nan)
+    for i, (x, y) in enumerate(series):
+        xs[i, :lengths[i]] = np.asarray(x, dtype=float)
+        ys[i, :lengths[i]] = np.asarray(y, dtype=float)
+    return xs, ys, lengths
+
+
+def bucket_edges(lengths, n_buckets):
+    every = (lengths - 2) / n_buckets
+    return 1 + np.floor(np.arange(n_buckets + 1)[None, :] * every[:, None]).astype(int)
+
+
+def gather_buckets(values, starts, ends):
+    width = max(int((ends - starts).max()), 1)
+    idx = starts[..., None] + np.arange(width)
+    valid = idx < ends[..., None]
+    idx = np.minimum(idx, values.shape[1] - 1)
+    rows = np.arange(len(values)).reshape((-1,) + (1,) * (idx.ndim - 1))
+    return values[rows, idx], idx, valid
+
+
+def lttb_indices(xs, ys, lengths, n_out):
+    n_series = len(xs)
+    rows = np.arange(n_series)
+    edges = bucket_edges(lengths, n_out - 2)
+
+    cx = np.nancumsum(np.pad(xs, ((0, 0), (1, 0))), axis=1)
+    cy = np.nancumsum(np.pad(ys, ((0, 0), (1, 0))), axis=1)
+    counts = np.maximum(np.diff(edges, axis=1), 1)
+    avg_x = (cx[rows[:, None], edges[:, 1:]] - cx[rows[:, None], edges[:, :-1]]) / counts
+    avg_y = (cy[rows[:, None], edges[:, 1:]] - cy[rows[:, None], edges[:, :-1]]) / counts
+    last = lengths - 1
+    avg_x = np.column_stack([avg_x[:, 1:], xs[rows, last]])
+    avg_y = np.column_stack([avg_y[:, 1:], ys[rows, last]])
+
+    selected = np.empty((n_series, n_out), dtype=int)
+    selected[:, 0] = 0
+    selected[:, -1] = last
+    for k in range(n_out - 2):
+        ax_, ay_ = xs[rows, selected[:, k]], ys[rows, selected[:, k]]
+        cand_x, idx, valid = gather_buckets(xs, edges[:, k], edges[:, k + 1])
+        cand_y = ys[rows[:, None], idx]
+        area = np.abs(
+            (ax_ - avg_x[:, k])[:, None] * (cand_y - ay_[:, None])
+            - (ax_[:, None] - cand_x) * (avg_y[:, k] - ay_)[:, None]
+        )
+        area = np.where(valid & ~np.isnan(area), area, -1.0)
+        selected[:, k + 1] = idx[rows, area.argmax(axis=1)]
+    return selected
+
+
+def minmax_indices(xs, ys, lengths, n_out):
+    n_buckets = max((n_out - 2) // 2, 1)
+    edges = bucket_edges(lengths, n_buckets)
+    values, idx, valid = gather_buckets(ys, edges[:, :-1], edges[:, 1:])
+    low = np.where(valid & ~np.isnan(values), values, np.inf).argmin(axis=2)
+    high = np.where(valid & ~np.isnan(values), values, -np.inf).argmax(axis=2)
+
+    picks = np.concatenate([
+        np.take_along_axis(idx, low[..., None], axis=2)[..., 0],
+        np.take_along_axis(idx, high[..., None], axis=2)[..., 0],
+    ], axis=1)
+    ends = np.column_stack([np.zeros(len(xs), dtype=int), lengths - 1])
+    return np.sort(np.concatenate([ends, picks], axis=1), axis=1)
+
+
+def decimation_indices(series, n_out, method=None):
+    method = TELEMETRY_DECIMATION if method is None else method
+    series = [(np.asarray(x), np.asarray(y)) for x, y in series]
+    keeps = [np.arange(len(x)) for x, _ in series]
+    if not method or n_out < 3:
+        return keeps
+
+    lengths = np.array([len(x) for x, _ in series])
+    todo = np.flatnonzero(lengths > n_out)
+    if len(todo) == 0:
+        return keeps
+
+    xs, ys, lengths = pad_series([series[i] for i in todo])
+    if method == "lttb":
+        picks = lttb_indices(xs, ys, lengths, n_out)
+    elif method == "minmax":
+        picks = minmax_indices(xs, ys, lengths, n_out)
+    else:
+        raise ValueError(f"Unknown decimation method: {method}")
+
+    for row, i in enumerate(todo):
+        keeps[i] = np.unique(picks[row])
+    return keeps
+
+
+def decimate_series(series, n_out, method=None):
+    series = [(np.asarray(x), np.asarray(y)) for x, y in series]
+    keeps = decimation_indices(series, n_out, method)
+    return [(x[keep], y[keep]) for (x, y), keep in zip(series, keeps)]
+
+
+def axis_pixel_width(ax):
+    return ax.get_position().width * ax.figure.get_figwidth() * FIGURE_DPI
+
+
+def axis_points(ax):
+    return int(axis_pixel_width(ax) * DECIMATION_POINTS_PER_PIXEL)
+
+
+def plot_telemetry(ax, lines, method=None):
+    decimated = decimate_series([(x, y) for x, y, _ in lines], axis_points(ax), method)
+    return [ax.plot(x, y, **kwargs)[0] for (x, y), (_, _, kwargs) in zip(decimated, lines)]
+
+
+def fill_telemetry(ax, x, y1, y2=0, where=None, method=None, **kwargs):
+    x = np.asarray(x, dtype=float)
+    y1 = np.broadcast_to(np.asarray(y1, dtype=float), x.shape)
+    y2 = np.broadcast_to(np.asarray(y2, dtype=float), x.shape)
+    keep = np.union1d(*decimation_indices([(x, y1), (x, y2)], axis_points(ax), method))
+    if where is not None:
+        where = np.asarray(where)[keep]
+    return ax.fill_between(x[keep], y1[keep], y2[keep], where=where, **kwargs)
+
+
 def save_figure(fig, filename, output_dir=None):
     from config import OUTPUT_DIR
     path = (output_dir or OUTPUT_DIR) / filename
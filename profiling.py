@@ -0,0 +1,197 @@
+import argparse
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from fnmatch import fnmatch
+import pandas as pd
+from config import PROFILE_PATH, PROFILE_DUMP_DIR
+
+_state = {"enabled": False, "cprofile": []}
+_records = []
+_lock = threading.Lock()
+_stage_lock = threading.Lock()
+_active = {}
+_local = threading.local()
+
+
+def enable(cprofile=None):
+    _state["enabled"] = True
+    _state["cprofile"] = list(cprofile or [])
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def settings():
+    return _state["enabled"], _state["cprofile"]
+
+
+def add_arguments(parser):
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--cprofile", nargs="+", default=None, metavar="STAGE")
+
+
+def enable_from_args(args):
+    if args.profile or args.cprofile:
+        enable(args.cprofile)
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return float("nan")
+
+
+def dump_path(name):
+    safe = re.sub(r"[^\w.-]+", "_", name)
+    return PROFILE_DUMP_DIR / f"{safe}.prof"
+
+
+def _start_cprofile(name):
+    if not any(fnmatch(name, pattern) for pattern in _state["cprofile"]):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        print(f"  Warning: another profiler is active; no cProfile dump for {name}")
+        return None
+    return profiler
+
+
+def _fold_peak():
+    peak = tracemalloc.get_traced_memory()[1]
+    for frame in _active.values():
+        frame["peak"] = max(frame["peak"], peak)
+    tracemalloc.reset_peak()
+
+
+def _emit(record):
+    sink = getattr(_local, "sink", None)
+    if sink is not None:
+        sink.append(record)
+        return
+    with _lock:
+        _records.append(record)
+
+
+@contextmanager
+def profile_stage(name, kind="stage"):
+    if not _state["enabled"]:
+        yield
+        return
+
+    stack = _local.__dict__.setdefault("stack", [])
+    frame = {"peak": 0}
+    with _stage_lock:
+        _fold_peak()
+        _active[id(frame)] = frame
+    stack.append(frame)
+
+    profiler = _start_cprofile(name)
+    rss, wall, cpu = rss_bytes(), time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+        if profiler is not None:
+            profiler.disable()
+            PROFILE_DUMP_DIR.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(dump_path(name))
+
+        stack.pop()
+        with _stage_lock:
+            _fold_peak()
+            del _active[id(frame)]
+        _emit({
+            "stage": name,
+            "kind": kind,
+            "depth": len(stack),
+            "pid": os.getpid(),
+            "wall": wall,
+            "cpu": cpu,
+            "peak_bytes": frame["peak"],
+            "rss_delta_bytes": rss_bytes() - rss,
+        })
+
+
+@contextmanager
+def collect():
+    previous = getattr(_local, "sink", None)
+    sink = _local.sink = []
+    try:
+        yield sink
+    finally:
+        _local.sink = previous
+
+
+def merge(records):
+    with _lock:
+        _records.extend(records)
+
+
+def records():
+    with _lock:
+        return list(_records)
+
+
+def profile_table(stages=None):
+    table = pd.DataFrame(records() if stages is None else stages)
+    if table.empty:
+        return table
+    table["ProcessPeakMB"] = table["peak_bytes"] / 2 ** 20
+    table["RSSDeltaMB"] = table["rss_delta_bytes"] / 2 ** 20
+    return table.rename(columns={"stage": "Stage", "kind": "Kind", "wall": "Wall", "cpu": "CPU"})[
+        ["Stage", "Kind", "Wall", "CPU", "ProcessPeakMB", "RSSDeltaMB"]
+    ]
+
+
+def write_profile(path=None):
+    path = path or PROFILE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"created": time.time(), "stages": records()}, indent=1))
+    return path
+
+
+def print_profile_summary(stages=None, top=15):
+    table = profile_table(stages)
+    if table.empty:
+        return
+    by_kind = table.groupby("Kind").agg(
+        Stages=("Stage", "count"), Wall=("Wall", "sum"), CPU=("CPU", "sum"), ProcessPeakMB=("ProcessPeakMB", "max"),
+    ).sort_values("Wall", ascending=False)
+    print("\n--- Profile by kind ---")
+    print(by_kind.round(2).to_string())
+    print(f"\n--- Slowest {min(top, len(table))} stages ---")
+    print(table.sort_values("Wall", ascending=False).head(top).round(2).to_string(index=False))
+
+
+def finish(path=None):
+    if not _state["enabled"]:
+        return None
+    path = write_profile(path)
+    print_profile_summary()
+    print(f"\nProfile written to {path}")
+    if _state["cprofile"]:
+        print(f"cProfile dumps in {PROFILE_DUMP_DIR}/")
+    return path
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Summarise a saved stage profile")
+    parser.add_argument("path", nargs="?", default=str(PROFILE_PATH))
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        print_profile_summary(json.load(f)["stages"], args.top)
+
+
+if __name__ == "__main__":
+    run()
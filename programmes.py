@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from config import (
+    PROGRAMME_CLUSTERS, PROGRAMME_INITS, PROGRAMME_MAX_ITER, PROGRAMME_SEED,
+    PROGRAMME_COLORS, COMPOUND_SOFTNESS, FALLBACK_COLOR,
+)
+from plotting import apply_theme, create_figure, add_watermark
+
+STINT_KEYS = ["Year", "Test", "Day", "Team", "Driver", "Stint"]
+SESSION_KEYS = ["Year", "Test", "Day"]
+FEATURES = ["LogStintLaps", "CoV", "GapToBest", "Trend", "Softness"]
+
+
+def _present(keys, laps):
+    return [k for k in keys if k in laps.columns]
+
+
+def build_stint_features(laps):
+    valid = laps.dropna(subset=["LapTimeSeconds", "Stint"])
+    valid = valid[valid["LapTimeSeconds"] > 0].sort_values(_present(STINT_KEYS, valid) + ["LapNumber"])
+    keys = _present(STINT_KEYS, valid)
+    if valid.empty:
+        return pd.DataFrame(columns=keys + ["StintLaps"] + FEATURES)
+
+    grouped = valid.groupby(keys, sort=False)
+    x = grouped.cumcount().astype(float)
+    y = valid["LapTimeSeconds"]
+    sums = pd.DataFrame({"x": x, "y": y, "xx": x * x, "xy": x * y, "yy": y * y}).groupby(
+        [valid[k] for k in keys], sort=False).sum()
+
+    stints = grouped.agg(
+        StintLaps=("LapTimeSeconds", "count"),
+        Compound=("Compound", "first"),
+        MeanTime=("LapTimeSeconds", "mean"),
+        MinTime=("LapTimeSeconds", "min"),
+    )
+    n = stints["StintLaps"].values
+    var_x = sums["xx"].values - sums["x"].values ** 2 / n
+    var_y = sums["yy"].values - sums["y"].values ** 2 / n
+    cov_xy = sums["xy"].values - sums["x"].values * sums["y"].values / n
+
+    stints["CoV"] = np.sqrt(np.maximum(var_y, 0) / np.maximum(n - 1, 1)) / stints["MeanTime"]
+    stints["Trend"] = np.where(var_x > 0, cov_xy / np.where(var_x > 0, var_x, 1), 0.0)
+    stints = stints.reset_index()
+
+    session = _present(SESSION_KEYS, stints)
+    best = stints.groupby(session)["MinTime"].transform("min") if session else stints["MinTime"].min()
+    stints["GapToBest"] = (stints["MinTime"] / best - 1) * 100
+    stints["LogStintLaps"] = np.log(stints["StintLaps"])
+    stints["Softness"] = stints["Compound"].astype(str).str.upper().map(COMPOUND_SOFTNESS).fillna(1.0)
+    return stints
+
+
+def standardise(features):
+    mean = features.mean(axis=0)
+    std = features.std(axis=0)
+    return (features - mean) / np.where(std > 0, std, 1.0)
+
+
+def squared_distances(points, centroids):
+    return (
+        (points ** 2).sum(axis=1)[:, None]
+        - 2 * points @ centroids.T
+        + (centroids ** 2).sum(axis=1)[None, :]
+    )
+
+
+def kmeans_plus_plus(points, k, rng):
+    centroids = [points[rng.integers(len(points))]]
+    closest = squared_distances(points, np.array(centroids))[:, 0]
+    for _ in range(1, k):
+        weights = np.maximum(closest, 0)
+        total = weights.sum()
+        pick = rng.choice(len(points), p=weights / total) if total > 0 else rng.integers(len(points))
+        centroids.append(points[pick])
+        closest = np.minimum(closest, squared_distances(points, points[pick][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def kmeans(points, k, n_init=None, max_iter=None, seed=None):
+    rng = np.random.default_rng(PROGRAMME_SEED if seed is None else seed)
+    k = min(k, len(points))
+    best = (np.inf, None, None)
+
+    for _ in range(n_init or PROGRAMME_INITS):
+        centroids = kmeans_plus_plus(points, k, rng)
+        for _ in range(max_iter or PROGRAMME_MAX_ITER):
+            labels = squared_distances(points, centroids).argmin(axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, points)
+            updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+            if np.allclose(updated, centroids):
+                break
+            centroids = updated
+
+        labels = squared_distances(points, centroids).argmin(axis=1)
+        inertia = ((points - centroids[labels]) ** 2).sum()
+        if inertia < best[0]:
+            best = (inertia, labels, centroids)
+    return best[1], best[2]
+
+
+def name_clusters(stints, labels):
+    profile = stints.assign(Cluster=labels).groupby("Cluster")[["StintLaps", "GapToBest"]].mean()
+    names = {}
+
+    remaining = profile
+    race = remaining["StintLaps"].idxmax()
+    names[race] = "Race Sim"
+    remaining = remaining.drop(race)
+    if not remaining.empty:
+        quali = remaining["GapToBest"].idxmin()
+        names[quali] = "Quali Sim"
+        remaining = remaining.drop(quali)
+    if not remaining.empty:
+        aero = remaining["GapToBest"].idxmax()
+        names[aero] = "Aero / Installation"
+        remaining = remaining.drop(aero)
+    for cluster in remaining.index:
+        names[cluster] = "Mid-Length"
+    return names
+
+
+def classify_stints(laps, n_clusters=None, seed=None):
+    stints = build_stint_features(laps)
+    if stints.empty:
+        return stints.assign(Cluster=pd.Series(dtype=int), Programme=pd.Series(dtype=str))
+
+    points = standardise(stints[FEATURES].values.astype(float))
+    labels, _ = kmeans(points, n_clusters or PROGRAMME_CLUSTERS, seed=seed)
+    stints["Cluster"] = labels
+    stints["Programme"] = stints["Cluster"].map(name_clusters(stints, labels))
+    return stints
+
+
+def tag_laps(laps, stints):
+    keys = _present(STINT_KEYS, stints)
+    return laps.merge(stints[keys + ["Programme"]], on=keys, how="left")
+
+
+def filter_programme(laps, programmes, stints=None):
+    programmes = [programmes] if isinstance(programmes, str) else list(programmes)
+    tagged = laps if "Programme" in laps.columns else tag_laps(laps, stints if stints is not None else classify_stints(laps))
+    return tagged[tagged["Programme"].isin(programmes)]
+
+
+def plot_programme_map(stints):
+    apply_theme()
+
+    if stints.empty:
+        return None
+
+    fig, ax = create_figure(width=14, height=8)
+    for programme, data in stints.groupby("Programme"):
+        ax.scatter(data["StintLaps"], data["GapToBest"], s=30, alpha=0.7,
+                   color=PROGRAMME_COLORS.get(programme, FALLBACK_COLOR), label=programme)
+
+    ax.set_xscale("log")
+    ax.set_xlabel("Stint Length (laps, log scale)")
+    ax.set_ylabel("Fastest Lap Gap to Session Best (%)")
+    ax.set_title("Run Programme Clusters")
+    ax.legend(loc="upper right")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def plot_programme_mix(stints):
+    apply_theme()
+
+    if stints.empty:
+        return None
+
+    counts = stints.pivot_table(index="Team", columns="Programme", values="StintLaps", aggfunc="sum", fill_value=0)
+    counts = counts.loc[counts.sum(axis=1).sort_values().index]
+
+    fig, ax = create_figure(width=14, height=8)
+    left = np.zeros(len(counts))
+    for programme in counts.columns:
+        ax.barh(counts.index, counts[programme], left=left, edgecolor="white",
+                color=PROGRAMME_COLORS.get(programme, FALLBACK_COLOR), label=programme)
+        left += counts[programme].values
+
+    ax.set_xlabel("Laps")
+    ax.set_title("Laps by Run Programme")
+    ax.legend(loc="lower right")
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_all(laps):
+    figures = {}
+    stints = classify_stints(laps)
+    figures["map"] = plot_programme_map(stints)
+    figures["mix"] = plot_programme_mix(stints)
+    return figures, stints
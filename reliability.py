@@ -1,12 +1,14 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
+from lazy_imports import lazy_import
 from plotting import (
     apply_theme, create_figure, build_color_maps,
     add_watermark, save_figure,
 )
 
+plt = lazy_import("matplotlib.pyplot")
+mcolors = lazy_import("matplotlib.colors")
+
 
 def compute_laps_per_team_day(laps):
     return (
@@ -0,0 +1,163 @@
+import os
+import importlib
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from config import RENDER_WORKERS, FIGURE_CACHE, FIGURE_FORMAT
+import profiling
+
+
+def figure_job(title, module, function, *args, prefix, local=False, fmt=None):
+    return {
+        "title": title,
+        "module": module,
+        "function": function,
+        "args": args,
+        "prefix": prefix,
+        "local": local,
+        "format": fmt or FIGURE_FORMAT,
+    }
+
+
+def to_plain(value):
+    if isinstance(value, pd.DataFrame) and type(value) is not pd.DataFrame:
+        return pd.DataFrame(value)
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(to_plain(v) for v in value)
+    return value
+
+
+def split_result(result):
+    if result is None:
+        return {}, ()
+    if isinstance(result, dict):
+        return result, ()
+    if isinstance(result, tuple) and result and isinstance(result[0], dict):
+        return result[0], result[1:]
+    return {"": result}, ()
+
+
+def _error(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _render_job(job, output_dir=None):
+    from plotting import save_figure
+    import matplotlib.pyplot as plt
+
+    outcome = {"saved": [], "errors": [], "extras": ()}
+    try:
+        func = getattr(importlib.import_module(job["module"]), job["function"])
+        with profiling.profile_stage(job["prefix"], "compute"):
+            figures, outcome["extras"] = split_result(func(*job["args"]))
+    except Exception as exc:
+        outcome["errors"].append((None, _error(exc), traceback.format_exc()))
+        return outcome
+
+    for name, fig in figures.items():
+        if fig is None:
+            continue
+        stem = f"{job['prefix']}_{name}" if name else job["prefix"]
+        filename = f"{stem}.{job['format']}"
+        try:
+            with profiling.profile_stage(filename, "render"):
+                outcome["saved"].append(save_figure(fig, filename, output_dir))
+        except Exception as exc:
+            plt.close(fig)
+            outcome["errors"].append((filename, _error(exc), traceback.format_exc()))
+    return outcome
+
+
+def render_job(job, output_dir=None):
+    with profiling.collect() as records:
+        outcome = _render_job(job, output_dir)
+    outcome["profile"] = records
+    return outcome
+
+
+def _init_worker(profile_settings=(False, [])):
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    enabled, cprofile = profile_settings
+    if enabled:
+        profiling.enable(cprofile)
+    from plotting import apply_theme
+    apply_theme()
+
+
+def _render_all(jobs, max_workers=None, output_dir=None):
+    workers = max_workers or RENDER_WORKERS or os.cpu_count() or 1
+    results = [None] * len(jobs)
+    remote = [i for i, job in enumerate(jobs) if not job["local"]]
+
+    if workers <= 1 or not remote:
+        for i, job in enumerate(jobs):
+            results[i] = render_job(job, output_dir)
+        return _merge_profiles(results)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(profiling.settings(),)) as pool:
+        futures = {
+            i: pool.submit(render_job, dict(jobs[i], args=to_plain(jobs[i]["args"])), output_dir)
+            for i in remote
+        }
+        for i, job in enumerate(jobs):
+            if job["local"]:
+                results[i] = render_job(job, output_dir)
+        for i, future in futures.items():
+            try:
+                results[i] = future.result()
+            except Exception as exc:
+                results[i] = {"saved": [], "errors": [(None, _error(exc), traceback.format_exc())], "extras": ()}
+    return _merge_profiles(results)
+
+
+def _merge_profiles(results):
+    for outcome in results:
+        profiling.merge(outcome.pop("profile", []))
+    return results
+
+
+def render_jobs(jobs, max_workers=None, output_dir=None, use_cache=None):
+    if not (FIGURE_CACHE if use_cache is None else use_cache):
+        return [dict(outcome, cached=False) for outcome in _render_all(jobs, max_workers, output_dir)]
+
+    import figure_cache
+
+    manifest = figure_cache.load_manifest(output_dir)
+    keys = [figure_cache.job_key(job) for job in jobs]
+    results = [figure_cache.lookup(manifest, job, key) for job, key in zip(jobs, keys)]
+    misses = [i for i, outcome in enumerate(results) if outcome is None]
+
+    rendered = _render_all([jobs[i] for i in misses], max_workers, output_dir)
+    for i, outcome in zip(misses, rendered):
+        results[i] = outcome
+        if not outcome["errors"]:
+            figure_cache.record(manifest, jobs[i], keys[i], outcome)
+
+    figure_cache.evict_stale(manifest)
+    figure_cache.save_manifest(manifest, output_dir)
+    missed = set(misses)
+    return [dict(outcome, cached=i not in missed) for i, outcome in enumerate(results)]
+
+
+def report(jobs, results, printers=None):
+    title = None
+    for job, outcome in zip(jobs, results):
+        if job["title"] != title:
+            title = job["title"]
+            print(f"\n--- {title} ---")
+        for path in outcome["saved"]:
+            print(f"  {'Cached' if outcome.get('cached') else 'Saved'}: {path}")
+        for filename, message, _ in outcome["errors"]:
+            print(f"  Warning: {filename or job['function']} failed ({message})")
+        printer = (printers or {}).get((job["module"], job["function"]))
+        if printer is not None and outcome["extras"]:
+            printer(*outcome["extras"])
+
+
+def report_cache(results):
+    cached = sum(1 for outcome in results if outcome.get("cached"))
+    print(f"\nFigure cache: {cached} hits, {len(results) - cached} misses")
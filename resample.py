@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from config import TELEMETRY_CHANNELS, RESAMPLE_POINTS
+
+
+def default_channels(tels):
+    return [
+        col for col in TELEMETRY_CHANNELS[1:]
+        if all(col in tel.columns for tel in tels)
+    ]
+
+
+def pack_telemetry(tels, channels):
+    lengths = np.array([len(tel) for tel in tels])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    distance = np.concatenate([tel["Distance"].values.astype(float) for tel in tels])
+    values = np.empty((len(channels), offsets[-1]))
+    for i, col in enumerate(channels):
+        values[i] = np.concatenate([tel[col].values.astype(float) for tel in tels])
+    return distance, values, offsets
+
+
+def distance_grid(distance, offsets, n_points=None, stop=None):
+    lengths = np.diff(offsets)
+    ends = distance[offsets[1:][lengths > 0] - 1]
+    end = np.median(ends) if stop is None else stop
+    return np.linspace(0.0, end, n_points or RESAMPLE_POINTS)
+
+
+def resample_packed(distance, values, offsets, grid):
+    n_laps = len(offsets) - 1
+    lengths = np.diff(offsets)
+    result = np.full((n_laps, len(values), len(grid)), np.nan)
+    if distance.size == 0:
+        return result
+
+    lap_id = np.repeat(np.arange(n_laps), lengths)
+    d_min = min(distance.min(), grid[0])
+    span = (max(distance.max(), grid[-1]) - d_min) * 2 + 1.0
+    keys = distance - d_min + lap_id * span
+
+    present = np.flatnonzero(lengths > 0)
+    first = keys[offsets[present]]
+    last = keys[offsets[present + 1] - 1]
+    queries = (grid[None, :] - d_min) + present[:, None] * span
+    queries = np.clip(queries, first[:, None], last[:, None]).ravel()
+
+    for i in range(len(values)):
+        result[present, i] = np.interp(queries, keys, values[i]).reshape(len(present), len(grid))
+    return result
+
+
+def resample_telemetry(tels, channels=None, n_points=None, grid=None):
+    channels = channels or default_channels(tels)
+    distance, values, offsets = pack_telemetry(tels, channels)
+    if grid is None:
+        grid = distance_grid(distance, offsets, n_points)
+    return resample_packed(distance, values, offsets, grid), grid, channels
+
+
+def batch_to_frames(batch, grid, channels):
+    frames = []
+    for lap in batch:
+        frame = pd.DataFrame({"Distance": grid})
+        for i, col in enumerate(channels):
+            frame[col] = lap[i]
+        frames.append(frame)
+    return frames
+
+
+def step_times(speed, grid):
+    step = np.diff(grid)
+    mean_speed = (speed[..., 1:] + speed[..., :-1]) / 2 / 3.6
+    return step / np.maximum(mean_speed, 1e-3)
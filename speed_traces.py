@@ -1,54 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from config import SPEED_TRACE_ERAS, TEAM_COLORS, FALLBACK_COLOR, BASELINE_YEAR
+from data_loader import load_test
 from plotting import (
     apply_theme, create_figure, build_color_maps,
-    add_watermark, save_figure,
+    add_watermark, save_figure, plot_telemetry, fill_telemetry,
 )
+from telemetry_cache import get_lap_telemetry, extract_many
+from resample import resample_telemetry, batch_to_frames, step_times
+from lap_index import build_lap_index, best_lap_record, best_lap_records, resolve_lap
 
 
-def get_fastest_soft_lap(sessions, driver=None):
-    for session in sessions:
-        laps = session.laps
-        soft_laps = laps[laps["Compound"] == "SOFT"]
+def get_fastest_soft_lap(lap_index, driver=None):
+    record = best_lap_record(lap_index, Compound="SOFT", Driver=driver)
+    return resolve_lap(record), record
 
-        if driver:
-            soft_laps = soft_laps[soft_laps["Driver"] == driver]
 
-        if soft_laps.empty:
-            continue
+def get_fastest_lap(lap_index, driver=None):
+    record = best_lap_record(lap_index, Driver=driver)
+    return resolve_lap(record), record
 
-        fastest = soft_laps.pick_fastest()
-        if fastest is not None and not fastest.empty:
-            return fastest, session
 
-    return None, None
+def record_year(record, default):
+    if record is None or pd.isna(record.get("Year")):
+        return default
+    return int(record["Year"])
 
 
-def get_fastest_lap(sessions, driver=None):
-    for session in sessions:
-        laps = session.laps
+def load_lap_batch(records, channels=None, n_points=None):
+    laps = [resolve_lap(record) for _, record in records.iterrows()]
+    tels, failures = extract_many(laps)
+    report_failures(failures)
 
-        if driver:
-            laps = laps[laps["Driver"] == driver]
+    kept = [i for i, tel in enumerate(tels) if tel is not None]
+    tels = [tels[i] for i in kept]
+    if not tels:
+        return pd.DataFrame(), None, None, []
 
-        if laps.empty:
-            continue
+    batch, grid, channels = resample_telemetry(tels, channels=channels, n_points=n_points)
+    return records.iloc[kept].reset_index(drop=True), batch, grid, channels
 
-        fastest = laps.pick_fastest()
-        if fastest is not None and not fastest.empty:
-            return fastest, session
 
-    return None, None
+def load_team_best_laps(lap_index, compound=None, channels=None, n_points=None):
+    records = best_lap_records(lap_index, "Team", Compound=compound)
+    return load_lap_batch(records, channels=channels, n_points=n_points)
+
+
+def report_failures(failures):
+    for _, row in failures.iterrows():
+        print(f"  Warning: telemetry failed for {row['Driver']} lap {row['LapNumber']} ({row['Error']})")
 
 
 def extract_telemetry(lap):
     try:
-        tel = lap.get_telemetry()
+        tel = get_lap_telemetry(lap)
         if tel is not None and not tel.empty:
             return tel
-    except Exception:
-        pass
+    except Exception as exc:
+        print(f"  Warning: telemetry failed ({type(exc).__name__}: {exc})")
     return None
 
 
@@ -77,40 +88,38 @@ def interpolate_to_common_distance(tel, n_points=1000):
     return result
 
 
-def plot_speed_comparison(tel_2026, tel_2025, label_2026="2026", label_2025="2025"):
+def plot_speed_comparison(tel_2026, tel_2025, label_2026="2026", label_2025="2025", year_2026=2026, year_2025=2025):
     apply_theme()
     fig, ax = create_figure(width=16, height=7)
 
     color_2025 = "#2166AC"  # blue
     color_2026 = "#E8002D"  # red
 
-    ax.plot(
-        tel_2025["Distance"], tel_2025["Speed"],
-        color=color_2025, linewidth=1.5, alpha=0.8, label=label_2025,
-    )
-    ax.plot(
-        tel_2026["Distance"], tel_2026["Speed"],
-        color=color_2026, linewidth=1.8, alpha=0.9, label=label_2026,
-    )
+    plot_telemetry(ax, [
+        (tel_2025["Distance"], tel_2025["Speed"],
+         dict(color=color_2025, linewidth=1.5, alpha=0.8, label=label_2025)),
+        (tel_2026["Distance"], tel_2026["Speed"],
+         dict(color=color_2026, linewidth=1.8, alpha=0.9, label=label_2026)),
+    ])
 
-    ax.fill_between(
-        tel_2026["Distance"],
+    fill_telemetry(
+        ax, tel_2026["Distance"],
         tel_2025["Speed"],
         tel_2026["Speed"],
         where=tel_2026["Speed"] > tel_2025["Speed"],
-        alpha=0.15, color=color_2026, label="2026 faster",
+        alpha=0.15, color=color_2026, label=f"{year_2026} faster",
     )
-    ax.fill_between(
-        tel_2026["Distance"],
+    fill_telemetry(
+        ax, tel_2026["Distance"],
         tel_2025["Speed"],
         tel_2026["Speed"],
         where=tel_2026["Speed"] < tel_2025["Speed"],
-        alpha=0.15, color=color_2025, label="2025 faster",
+        alpha=0.15, color=color_2025, label=f"{year_2025} faster",
     )
 
     ax.set_xlabel("Distance (m)")
     ax.set_ylabel("Speed (km/h)")
-    ax.set_title("Speed Trace: 2026 New Era vs 2025 Regulations")
+    ax.set_title(f"Speed Trace: {year_2026} New Era vs {year_2025} Regulations")
     ax.legend(loc="lower right")
 
     add_watermark(fig)
@@ -118,7 +127,7 @@ def plot_speed_comparison(tel_2026, tel_2025, label_2026="2026", label_2025="202
     return fig
 
 
-def plot_full_telemetry_comparison(tel_2026, tel_2025, label_2026="2026", label_2025="2025"):
+def plot_full_telemetry_comparison(tel_2026, tel_2025, label_2026="2026", label_2025="2025", year_2026=2026, year_2025=2025):
     apply_theme()
 
     has_throttle = "Throttle" in tel_2026.columns and "Throttle" in tel_2025.columns
@@ -140,37 +149,39 @@ def plot_full_telemetry_comparison(tel_2026, tel_2025, label_2026="2026", label_
 
     row = 0
 
-    axes[row].plot(tel_2025["Distance"], tel_2025["Speed"],
-                   color=color_2025, linewidth=1.5, alpha=0.8, label=label_2025)
-    axes[row].plot(tel_2026["Distance"], tel_2026["Speed"],
-                   color=color_2026, linewidth=1.8, alpha=0.9, label=label_2026)
+    plot_telemetry(axes[row], [
+        (tel_2025["Distance"], tel_2025["Speed"],
+         dict(color=color_2025, linewidth=1.5, alpha=0.8, label=label_2025)),
+        (tel_2026["Distance"], tel_2026["Speed"],
+         dict(color=color_2026, linewidth=1.8, alpha=0.9, label=label_2026)),
+    ])
     axes[row].set_ylabel("Speed (km/h)")
-    axes[row].set_title("Speed Trace: 2026 vs 2025 Bahrain Testing")
+    axes[row].set_title(f"Speed Trace: {year_2026} vs {year_2025} Bahrain Testing")
     axes[row].legend(loc="lower right")
     row += 1
 
     if has_throttle:
-        axes[row].plot(tel_2025["Distance"], tel_2025["Throttle"],
-                       color=color_2025, linewidth=1.2, alpha=0.8)
-        axes[row].plot(tel_2026["Distance"], tel_2026["Throttle"],
-                       color=color_2026, linewidth=1.5, alpha=0.9)
+        plot_telemetry(axes[row], [
+            (tel_2025["Distance"], tel_2025["Throttle"], dict(color=color_2025, linewidth=1.2, alpha=0.8)),
+            (tel_2026["Distance"], tel_2026["Throttle"], dict(color=color_2026, linewidth=1.5, alpha=0.9)),
+        ])
         axes[row].set_ylabel("Throttle %")
         axes[row].set_ylim(-5, 105)
         row += 1
 
     if has_brake:
-        axes[row].plot(tel_2025["Distance"], tel_2025["Brake"],
-                       color=color_2025, linewidth=1.2, alpha=0.8)
-        axes[row].plot(tel_2026["Distance"], tel_2026["Brake"],
-                       color=color_2026, linewidth=1.5, alpha=0.9)
+        plot_telemetry(axes[row], [
+            (tel_2025["Distance"], tel_2025["Brake"], dict(color=color_2025, linewidth=1.2, alpha=0.8)),
+            (tel_2026["Distance"], tel_2026["Brake"], dict(color=color_2026, linewidth=1.5, alpha=0.9)),
+        ])
         axes[row].set_ylabel("Brake")
         row += 1
 
     if has_gear:
-        axes[row].plot(tel_2025["Distance"], tel_2025["nGear"],
-                       color=color_2025, linewidth=1.2, alpha=0.8)
-        axes[row].plot(tel_2026["Distance"], tel_2026["nGear"],
-                       color=color_2026, linewidth=1.5, alpha=0.9)
+        plot_telemetry(axes[row], [
+            (tel_2025["Distance"], tel_2025["nGear"], dict(color=color_2025, linewidth=1.2, alpha=0.8)),
+            (tel_2026["Distance"], tel_2026["nGear"], dict(color=color_2026, linewidth=1.5, alpha=0.9)),
+        ])
         axes[row].set_ylabel("Gear")
         row += 1
 
@@ -181,26 +192,26 @@ def plot_full_telemetry_comparison(tel_2026, tel_2025, label_2026="2026", label_
     return fig
 
 
-def plot_speed_delta(tel_2026, tel_2025):
+def plot_speed_delta(tel_2026, tel_2025, year_2026=2026, year_2025=2025):
     apply_theme()
     fig, ax = create_figure(width=16, height=5)
 
     delta = tel_2026["Speed"].values - tel_2025["Speed"].values
     distance = tel_2026["Distance"].values
 
-    ax.fill_between(
-        distance, 0, delta,
-        where=delta >= 0, alpha=0.6, color="#E8002D", label="2026 faster",
+    fill_telemetry(
+        ax, distance, 0, delta,
+        where=delta >= 0, alpha=0.6, color="#E8002D", label=f"{year_2026} faster",
     )
-    ax.fill_between(
-        distance, 0, delta,
-        where=delta < 0, alpha=0.6, color="#2166AC", label="2025 faster",
+    fill_telemetry(
+        ax, distance, 0, delta,
+        where=delta < 0, alpha=0.6, color="#2166AC", label=f"{year_2025} faster",
     )
     ax.axhline(y=0, color="#333333", linewidth=0.8)
 
     ax.set_xlabel("Distance (m)")
     ax.set_ylabel("Speed Delta (km/h)")
-    ax.set_title("Speed Advantage: 2026 vs 2025")
+    ax.set_title(f"Speed Advantage: {year_2026} vs {year_2025}")
     ax.legend()
 
     add_watermark(fig)
@@ -237,7 +248,6 @@ def plot_sector_comparison(laps_2026, laps_2025):
         ax = axes[idx]
         data = sectors_2026.sort_values(sector)
 
-        from config import TEAM_COLORS, FALLBACK_COLOR
         colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in data["Team"]]
 
         ax.barh(data["Team"], data[sector], color=colors, alpha=0.8)
@@ -254,43 +264,284 @@ def plot_sector_comparison(laps_2026, laps_2025):
     return fig
 
 
-def generate_speed_traces(sessions_2026, sessions_2025, driver_2026=None, driver_2025=None):
+def compute_cumulative_time(speed, grid):
+    steps = step_times(speed, grid)
+    cumulative = np.zeros(speed.shape)
+    np.cumsum(steps, axis=-1, out=cumulative[..., 1:])
+    return cumulative
+
+
+def compute_delta_time(speed, grid, reference=0):
+    cumulative = compute_cumulative_time(speed, grid)
+    return cumulative - cumulative[reference], cumulative
+
+
+def validate_delta_time(cumulative, lap_times, labels, reference=0):
+    lap_times = np.asarray(lap_times, dtype=float)
+    integrated = cumulative[:, -1]
+    table = pd.DataFrame({
+        "Label": labels,
+        "LapTime": lap_times,
+        "IntegratedTime": integrated,
+        "ActualDelta": lap_times - lap_times[reference],
+        "IntegratedDelta": integrated - integrated[reference],
+    })
+    table["DeltaError"] = table["IntegratedDelta"] - table["ActualDelta"]
+    return table
+
+
+def plot_delta_time(grid, delta, labels, colors, reference_label, title=None):
+    apply_theme()
+    fig, ax = create_figure(width=16, height=6)
+
+    plot_telemetry(ax, [
+        (grid, row, dict(color=color, linewidth=1.5, alpha=0.85, label=label))
+        for row, label, color in zip(delta, labels, colors)
+        if label != reference_label
+    ])
+
+    ax.axhline(y=0, color="#333333", linewidth=0.8)
+    ax.set_xlabel("Distance (m)")
+    ax.set_ylabel(f"Time Delta to {reference_label} (s, positive = slower)")
+    ax.set_title(title or f"Cumulative Time Delta vs {reference_label}")
+    ax.legend(loc="upper left", ncol=2, fontsize=9)
+
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_delta_time(lap_index, compound=None):
+    figures = {}
+    records, batch, grid, channels = load_team_best_laps(lap_index, compound=compound)
+    if records.empty:
+        return figures, pd.DataFrame()
+
+    labels = records["Team"].tolist()
+    reference = int(records["LapTimeSeconds"].values.argmin())
+    delta, cumulative = compute_delta_time(batch[:, channels.index("Speed")], grid, reference)
+    validation = validate_delta_time(cumulative, records["LapTimeSeconds"], labels, reference)
+
+    colors = [TEAM_COLORS.get(t, FALLBACK_COLOR) for t in labels]
+    figures["delta_time"] = plot_delta_time(
+        grid, delta, labels, colors, labels[reference],
+        title=f"Cumulative Time Delta to Fastest Team Lap ({labels[reference]})",
+    )
+    return figures, validation
+
+
+def generate_speed_traces(index_2026, index_2025, driver_2026=None, driver_2025=None):
     figures = {}
 
-    lap_2026, _ = get_fastest_soft_lap(sessions_2026, driver=driver_2026)
-    lap_2025, _ = get_fastest_soft_lap(sessions_2025, driver=driver_2025)
+    lap_2026, record_2026 = get_fastest_soft_lap(index_2026, driver=driver_2026)
+    lap_2025, record_2025 = get_fastest_soft_lap(index_2025, driver=driver_2025)
 
     if lap_2026 is None:
-        lap_2026, _ = get_fastest_lap(sessions_2026, driver=driver_2026)
+        lap_2026, record_2026 = get_fastest_lap(index_2026, driver=driver_2026)
     if lap_2025 is None:
-        lap_2025, _ = get_fastest_lap(sessions_2025, driver=driver_2025)
+        lap_2025, record_2025 = get_fastest_lap(index_2025, driver=driver_2025)
 
     if lap_2026 is None or lap_2025 is None:
         return figures
 
-    tel_2026 = extract_telemetry(lap_2026)
-    tel_2025 = extract_telemetry(lap_2025)
+    (tel_2026, tel_2025), failures = extract_many([lap_2026, lap_2025])
+    report_failures(failures)
 
     if tel_2026 is None or tel_2025 is None:
         return figures
 
-    tel_2026_interp = interpolate_to_common_distance(tel_2026)
-    tel_2025_interp = interpolate_to_common_distance(tel_2025)
-
-    if tel_2026_interp is None or tel_2025_interp is None:
-        return figures
+    batch, grid, channels = resample_telemetry([tel_2026, tel_2025])
+    tel_2026_interp, tel_2025_interp = batch_to_frames(batch, grid, channels)
 
+    year_26 = record_year(record_2026, 2026)
+    year_25 = record_year(record_2025, BASELINE_YEAR)
     drv_26 = driver_2026 or "Best"
     drv_25 = driver_2025 or "Best"
-    label_26 = f"2026 ({drv_26})"
-    label_25 = f"2025 ({drv_25})"
+    label_26 = f"{year_26} ({drv_26})"
+    label_25 = f"{year_25} ({drv_25})"
 
     figures["speed_comparison"] = plot_speed_comparison(
-        tel_2026_interp, tel_2025_interp, label_26, label_25
+        tel_2026_interp, tel_2025_interp, label_26, label_25, year_26, year_25
     )
     figures["full_telemetry"] = plot_full_telemetry_comparison(
-        tel_2026_interp, tel_2025_interp, label_26, label_25
+        tel_2026_interp, tel_2025_interp, label_26, label_25, year_26, year_25
+    )
+    figures["speed_delta"] = plot_speed_delta(tel_2026_interp, tel_2025_interp, year_26, year_25)
+
+    delta, _ = compute_delta_time(batch[:, channels.index("Speed")], grid, reference=1)
+    figures["delta_time"] = plot_delta_time(
+        grid, delta, [label_26, label_25], ["#E8002D", "#2166AC"], label_25,
+        title=f"Cumulative Time Delta: {year_26} vs {year_25}",
+    )
+
+    return figures
+
+
+def load_era(era):
+    _, laps = load_test(era["year"], era["test"], era["days"])
+    return laps
+
+
+def load_eras(eras, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers or len(eras)) as pool:
+        return list(pool.map(load_era, eras))
+
+
+def get_era_best_lap(lap_index, driver=None):
+    lap, _ = get_fastest_soft_lap(lap_index, driver=driver)
+    if lap is None:
+        lap, _ = get_fastest_lap(lap_index, driver=driver)
+    return lap
+
+
+def era_label(era):
+    return era.get("label", str(era["year"]))
+
+
+def era_color(era, i):
+    cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    return era.get("color") or cycle[i % len(cycle)]
+
+
+def resample_eras(eras, era_laps):
+    laps = [get_era_best_lap(build_lap_index(laps), era.get("driver"))
+            for era, laps in zip(eras, era_laps)]
+    tels, failures = extract_many(laps)
+    report_failures(failures)
+    if any(tel is None for tel in tels):
+        return None
+
+    batch, grid, channels = resample_telemetry(tels, channels=["Speed", "Throttle", "Brake", "nGear"])
+    return batch_to_frames(batch, grid, channels)
+
+
+def plot_era_speed_comparison(tels, eras):
+    apply_theme()
+    n = len(eras) - 1
+    fig, axes = plt.subplots(n, 1, figsize=(16, 6 * n), sharex=True, squeeze=False)
+    fig.set_facecolor("white")
+
+    ref, ref_era = tels[0], eras[0]
+    ref_label, ref_color = era_label(ref_era), era_color(ref_era, 0)
+
+    for i, ax in enumerate(axes[:, 0], start=1):
+        tel, label, color = tels[i], era_label(eras[i]), era_color(eras[i], i)
+        plot_telemetry(ax, [
+            (tel["Distance"], tel["Speed"],
+             dict(color=color, linewidth=1.5, alpha=0.8, label=f"{label} (Best)")),
+            (ref["Distance"], ref["Speed"],
+             dict(color=ref_color, linewidth=1.8, alpha=0.9, label=f"{ref_label} (Best)")),
+        ])
+        fill_telemetry(ax, ref["Distance"], tel["Speed"], ref["Speed"],
+                       where=ref["Speed"] > tel["Speed"],
+                       alpha=0.15, color=ref_color, label=f"{ref_label} faster")
+        fill_telemetry(ax, ref["Distance"], tel["Speed"], ref["Speed"],
+                       where=ref["Speed"] < tel["Speed"],
+                       alpha=0.15, color=color, label=f"{label} faster")
+        ax.set_ylabel("Speed (km/h)")
+        ax.set_title(f"Speed Trace: {ref_label} vs {label} Pre-Season Testing")
+        ax.legend(loc="lower right")
+
+    axes[-1, 0].set_xlabel("Distance (m)")
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def plot_era_speed_delta(tels, eras):
+    apply_theme()
+    n = len(eras) - 1
+    fig, axes = plt.subplots(n, 1, figsize=(16, 4.5 * n), sharex=True, squeeze=False)
+    fig.set_facecolor("white")
+
+    ref, ref_era = tels[0], eras[0]
+    ref_label, ref_color = era_label(ref_era), era_color(ref_era, 0)
+    dist = ref["Distance"].values
+
+    for i, ax in enumerate(axes[:, 0], start=1):
+        label, color = era_label(eras[i]), era_color(eras[i], i)
+        delta = ref["Speed"].values - tels[i]["Speed"].values
+
+        fill_telemetry(ax, dist, 0, delta, where=delta >= 0,
+                       alpha=0.6, color=ref_color, label=f"{ref_label} faster")
+        fill_telemetry(ax, dist, 0, delta, where=delta < 0,
+                       alpha=0.6, color=color, label=f"{label} faster")
+        ax.axhline(y=0, color="#333333", linewidth=0.8)
+        ax.set_ylabel("Speed Delta (km/h)")
+        ax.set_title(f"Speed Advantage: {ref_label} vs {label}")
+        ax.legend(loc="upper right")
+
+    axes[-1, 0].set_xlabel("Distance (m)")
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def plot_era_full_telemetry(tels, eras):
+    apply_theme()
+
+    channels = [
+        (col, ylabel) for col, ylabel in
+        [("Throttle", "Throttle %"), ("Brake", "Brake"), ("nGear", "Gear")]
+        if all(col in tel.columns for tel in tels)
+    ]
+    n_rows = 1 + len(channels)
+    fig, axes = plt.subplots(
+        n_rows, 1, figsize=(16, 4 + 2.5 * n_rows),
+        gridspec_kw={"height_ratios": [3] + [1] * len(channels)},
+        sharex=True, squeeze=False,
     )
-    figures["speed_delta"] = plot_speed_delta(tel_2026_interp, tel_2025_interp)
+    axes = axes[:, 0]
+    fig.set_facecolor("white")
+
+    order = list(range(1, len(eras))) + [0]
+    styles = {i: (era_color(eras[i], i), i == 0) for i in order}
+    plot_telemetry(axes[0], [
+        (tels[i]["Distance"], tels[i]["Speed"],
+         dict(color=color, linewidth=1.8 if ref else 1.5, alpha=0.9 if ref else 0.8,
+              label=f"{era_label(eras[i])} (Best)"))
+        for i, (color, ref) in styles.items()
+    ])
+    for ax, (col, _) in zip(axes[1:], channels):
+        plot_telemetry(ax, [
+            (tels[i]["Distance"], tels[i][col],
+             dict(color=color, linewidth=1.5 if ref else 1.2, alpha=0.9 if ref else 0.8))
+            for i, (color, ref) in styles.items()
+        ])
+
+    labels = " vs ".join(era_label(e) for e in eras)
+    axes[0].set_ylabel("Speed (km/h)")
+    axes[0].set_title(f"Speed Trace: {labels} Bahrain Testing")
+    axes[0].legend(loc="lower right")
+
+    for ax, (col, ylabel) in zip(axes[1:], channels):
+        ax.set_ylabel(ylabel)
+        if col == "Throttle":
+            ax.set_ylim(-5, 105)
+        elif col == "Brake":
+            ax.set_yticks([0, 1])
+            ax.set_yticklabels(["Off", "On"])
+            ax.set_ylim(-0.1, 1.1)
+
+    axes[-1].set_xlabel("Distance (m)")
+    add_watermark(fig)
+    fig.tight_layout()
+    return fig
+
+
+def generate_era_comparison(eras=None, max_workers=None):
+    eras = eras or SPEED_TRACE_ERAS
+    figures = {}
+
+    if len(eras) < 2:
+        return figures
+
+    tels = resample_eras(eras, load_eras(eras, max_workers))
+    if tels is None:
+        return figures
 
-    return figures
\ No newline at end of file
+    labels = "_vs_".join(era_label(e) for e in reversed(eras))
+    figures["speed_comparison_stacked"] = plot_era_speed_comparison(tels, eras)
+    figures["speed_delta_stacked"] = plot_era_speed_delta(tels, eras)
+    figures[f"full_telemetry_{labels}"] = plot_era_full_telemetry(tels, eras)
+    return figures
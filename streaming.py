@@ -0,0 +1,117 @@
+import argparse
+import gc
+import pandas as pd
+from config import YEAR, WEEK1_TEST_NUMBER, WEEK1_DAYS, RESAMPLE_POINTS
+import data_loader
+from profiling import rss_bytes
+from async_pipeline import summarise_session, merge_sessions
+
+
+def test_specs(year, test_number, days, week=None):
+    return [(year, test_number, day, week) for day in days]
+
+
+def team_best_laps(laps):
+    valid = laps.dropna(subset=["LapTimeSeconds"])
+    valid = valid[valid["LapTimeSeconds"] > 0]
+    if "Deleted" in valid.columns:
+        valid = valid[valid["Deleted"] != True]
+    if valid.empty:
+        return []
+    return list(valid.groupby("Team")["LapTimeSeconds"].idxmin().values)
+
+
+def session_features(laps, n_points=None):
+    from telemetry_cache import extract_many
+    from resample import resample_telemetry, batch_to_frames
+    from speed_traces import report_failures
+
+    labels = team_best_laps(laps)
+    tels, failures = extract_many([laps.loc[label] for label in labels])
+    report_failures(failures)
+
+    features = []
+    for label, tel in zip(labels, tels):
+        if tel is None:
+            continue
+        batch, grid, channels = resample_telemetry([tel], n_points=n_points or RESAMPLE_POINTS)
+        record = pd.Series(laps.loc[label].to_dict())
+        features.append((record, batch_to_frames(batch, grid, channels)[0]))
+    return features
+
+
+def iter_sessions(specs, telemetry=True, n_points=None):
+    for year, test_number, day, week in specs:
+        session, laps = data_loader.session_laps(year, test_number, day, week)
+        features = session_features(laps, n_points) if telemetry else []
+        summary = summarise_session(pd.DataFrame(laps))
+        summary.update(key=(year, test_number, day), features=features)
+
+        del session, laps
+        gc.collect()
+        yield summary
+
+
+def keep_best(best, features):
+    for record, frame in features:
+        current = best.get(record["Team"])
+        if current is None or record["LapTimeSeconds"] < current[0]["LapTimeSeconds"]:
+            best[record["Team"]] = (record, frame)
+    return best
+
+
+def best_lap_batch(best, channels=None, n_points=None):
+    from resample import resample_telemetry
+
+    if not best:
+        return pd.DataFrame(), None, None, []
+    records = pd.DataFrame([record for record, _ in best.values()])
+    records = records.sort_values("LapTimeSeconds")
+    frames = [best[team][1] for team in records["Team"]]
+    batch, grid, channels = resample_telemetry(frames, channels=channels, n_points=n_points)
+    return records.reset_index(drop=True), batch, grid, channels
+
+
+def stream_sessions(specs, telemetry=True, n_points=None, verbose=True):
+    sessions, best = [], {}
+    for summary in iter_sessions(specs, telemetry, n_points):
+        keep_best(best, summary.pop("features"))
+        sessions.append(summary)
+        if verbose:
+            year, test_number, day = summary["key"]
+            print(f"  {year} test {test_number} day {day}: {len(summary['laps'])} laps, "
+                  f"RSS {rss_bytes() / 2 ** 20:.0f} MB")
+
+    if not sessions:
+        return {}
+    result = merge_sessions(sessions)
+    result["team_best"] = best_lap_batch(best, n_points=n_points)
+    return result
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Process test sessions one at a time, releasing each after use")
+    parser.add_argument("--year", type=int, default=YEAR)
+    parser.add_argument("--tests", nargs="+", type=int, default=[WEEK1_TEST_NUMBER])
+    parser.add_argument("--days", nargs="+", type=int, default=WEEK1_DAYS)
+    parser.add_argument("--no-telemetry", action="store_true")
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+
+    data_loader.setup(offline=args.offline)
+    specs = [spec for test in args.tests for spec in test_specs(args.year, test, args.days)]
+    result = stream_sessions(specs, telemetry=not args.no_telemetry)
+    if not result:
+        return
+
+    print(f"\n{len(result['laps'])} laps, {len(result['clean'])} after filtering, "
+          f"{len(result['long_runs'])} long runs")
+    if not result["pace"].empty:
+        print(result["pace"][["Team", "MeanLongRunPace", "DeltaToLeader", "TestingRank"]].to_string(index=False))
+    records = result["team_best"][0]
+    if not records.empty:
+        print(f"\nTeam best laps with telemetry: {len(records)}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_TEAMS = [
+    "McLaren", "Mercedes", "Red Bull Racing", "Ferrari", "Williams",
+    "Racing Bulls", "Aston Martin", "Haas F1 Team", "Kick Sauber", "Alpine",
+]
+
+BASE_LAP_TIME = 94.0
+TEAM_SPREAD = 1.8
+COMPOUND_OFFSETS = {"SOFT": 0.0, "MEDIUM": 0.5, "HARD": 1.0}
+
+
+def team_strengths(teams, seed=0):
+    rng = np.random.default_rng(seed)
+    return dict(zip(teams, np.sort(rng.uniform(0, TEAM_SPREAD, len(teams)))))
+
+
+def generate_test_laps(year, test_number=1, days=(1, 2, 3), teams=None,
+                       seed=None, stints_per_day=8, week=None):
+    teams = list(teams or DEFAULT_TEAMS)
+    seed = year if seed is None else seed
+    rng = np.random.default_rng(seed)
+    strengths = team_strengths(teams, seed)
+    compounds = np.array(list(COMPOUND_OFFSETS))
+    compound_offsets = np.array(list(COMPOUND_OFFSETS.values()))
+
+    frames = []
+    for day in days:
+        for team in teams:
+            driver = f"{team[:3].upper()}{day}"
+            programme = rng.random(stints_per_day)
+            stint_laps = np.where(
+                programme < 0.3, rng.integers(10, 26, stints_per_day),
+                np.where(programme < 0.7, rng.integers(4, 10, stints_per_day),
+                         rng.integers(1, 4, stints_per_day)),
+            )
+            stint_compound = rng.integers(0, len(compounds), stints_per_day)
+
+            stint_id = np.repeat(np.arange(1, stints_per_day + 1), stint_laps)
+            lap_in_stint = np.concatenate([np.arange(n) for n in stint_laps])
+            is_edge = np.concatenate([
+                np.isin(np.arange(n), [0, n - 1]) for n in stint_laps
+            ])
+            lap_compound = np.repeat(stint_compound, stint_laps)
+
+            n_laps = len(stint_id)
+            fuel_effect = np.repeat(rng.uniform(0, 2.5, stints_per_day), stint_laps)
+            lap_time = (
+                BASE_LAP_TIME
+                + strengths[team]
+                + compound_offsets[lap_compound]
+                + fuel_effect
+                - 0.03 * lap_in_stint
+                + rng.normal(0, 0.35, n_laps)
+            )
+            lap_time = np.where(is_edge & (stint_laps[stint_id - 1] > 2), lap_time * 1.35, lap_time)
+
+            frames.append(pd.DataFrame({
+                "Driver": driver,
+                "Team": team,
+                "LapNumber": np.arange(1, n_laps + 1, dtype=float),
+                "Stint": stint_id.astype(float),
+                "Compound": compounds[lap_compound],
+                "LapTimeSeconds": lap_time,
+                "IsAccurate": ~is_edge,
+                "Day": day,
+            }))
+
+    laps = pd.concat(frames, ignore_index=True)
+    laps["LapTime"] = pd.to_timedelta(laps["LapTimeSeconds"], unit="s")
+    for sector, share in [("Sector1Time", 0.31), ("Sector2Time", 0.42), ("Sector3Time", 0.27)]:
+        laps[sector] = pd.to_timedelta(laps["LapTimeSeconds"] * share, unit="s")
+    laps["Year"] = year
+    laps["Test"] = test_number
+    if week is not None:
+        laps["Week"] = week
+    return laps
+
+
+def generate_standings(year, teams=None, seed=None, noise=1.5):
+    teams = list(teams or DEFAULT_TEAMS)
+    seed = year if seed is None else seed
+    strengths = team_strengths(teams, seed)
+    rng = np.random.default_rng(seed + 1)
+    season_form = np.array([strengths[t] for t in teams]) + rng.normal(0, noise * 0.3, len(teams))
+
+    standings = pd.DataFrame({"Year": year, "Team": teams, "SeasonForm": season_form})
+    standings["WCC_Finish"] = standings["SeasonForm"].rank(method="first").astype(int)
+    return standings.drop(columns="SeasonForm").sort_values("WCC_Finish").reset_index(drop=True)
@@ -0,0 +1,160 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from config import (
+    TELEMETRY_CACHE_DIR, TELEMETRY_CACHE_MAX_BYTES, TELEMETRY_CHANNELS, TELEMETRY_WORKERS,
+)
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(text)).strip("-").lower()
+
+
+def session_key(session):
+    date = pd.Timestamp(session.date).strftime("%Y%m%d")
+    return f"{session.event.year}_{_slug(session.event['EventName'])}_{_slug(session.name)}_{date}"
+
+
+def lap_key(lap):
+    return session_key(lap.session), str(lap["Driver"]), int(lap["LapNumber"])
+
+
+def lap_cache_path(key, cache_dir=None):
+    session, driver, lap_number = key
+    return (cache_dir or TELEMETRY_CACHE_DIR) / session / driver / f"{lap_number:03d}.npy"
+
+
+def telemetry_to_array(tel):
+    array = np.full((len(TELEMETRY_CHANNELS), len(tel)), np.nan)
+    for i, col in enumerate(TELEMETRY_CHANNELS):
+        if col in tel.columns:
+            array[i] = tel[col].values.astype(float)
+    return np.ascontiguousarray(array)
+
+
+def array_to_telemetry(array):
+    columns = {
+        col: array[i] for i, col in enumerate(TELEMETRY_CHANNELS)
+        if not np.isnan(array[i]).all()
+    }
+    return pd.DataFrame(columns)
+
+
+def read_cached_array(key, cache_dir=None):
+    path = lap_cache_path(key, cache_dir)
+    try:
+        array = np.load(path, mmap_mode="r")
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+    os.utime(path)
+    return array
+
+
+def write_cached_array(key, array, cache_dir=None):
+    path = lap_cache_path(key, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+    return path
+
+
+def store_telemetry(key, tel, cache_dir=None, max_bytes=None, evict=False):
+    array = telemetry_to_array(tel)
+    write_cached_array(key, array, cache_dir)
+    if evict:
+        evict_cache(max_bytes, cache_dir)
+    return array
+
+
+def get_lap_telemetry(lap, cache_dir=None):
+    key = lap_key(lap)
+    array = read_cached_array(key, cache_dir)
+    if array is not None:
+        return array_to_telemetry(array)
+
+    tel = lap.get_telemetry()
+    if tel is None or tel.empty:
+        return None
+    return array_to_telemetry(store_telemetry(key, tel, cache_dir))
+
+
+def _fetch_telemetry(lap):
+    tel = lap.get_telemetry()
+    if tel is None or tel.empty:
+        raise ValueError("empty telemetry")
+    return tel
+
+
+def extract_many(laps, max_workers=None, cache_dir=None):
+    results = [None] * len(laps)
+    failures = []
+    pending = {}
+
+    for i, lap in enumerate(laps):
+        try:
+            key = lap_key(lap)
+        except Exception as exc:
+            failures.append({"Position": i, "Session": None, "Driver": None, "LapNumber": None,
+                             "Error": f"{type(exc).__name__}: {exc}"})
+            continue
+        array = read_cached_array(key, cache_dir)
+        if array is not None:
+            results[i] = array_to_telemetry(array)
+        else:
+            pending[i] = key
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers or TELEMETRY_WORKERS) as pool:
+            futures = {pool.submit(_fetch_telemetry, laps[i]): i for i in pending}
+            for future in as_completed(futures):
+                i = futures[future]
+                key = pending[i]
+                try:
+                    array = store_telemetry(key, future.result(), cache_dir)
+                    results[i] = array_to_telemetry(array)
+                except Exception as exc:
+                    session, driver, lap_number = key
+                    failures.append({"Position": i, "Session": session, "Driver": driver,
+                                     "LapNumber": lap_number, "Error": f"{type(exc).__name__}: {exc}"})
+        evict_cache(cache_dir=cache_dir)
+
+    failures = pd.DataFrame(failures, columns=["Position", "Session", "Driver", "LapNumber", "Error"])
+    return results, failures.sort_values("Position").reset_index(drop=True)
+
+
+def list_cache_entries(cache_dir=None):
+    root = cache_dir or TELEMETRY_CACHE_DIR
+    if not root.exists():
+        return pd.DataFrame(columns=["Session", "Driver", "LapNumber", "Path", "Bytes", "LastUsed"])
+
+    rows = []
+    for path in root.glob("*/*/*.npy"):
+        stat = path.stat()
+        rows.append({
+            "Session": path.parent.parent.name,
+            "Driver": path.parent.name,
+            "LapNumber": int(path.stem),
+            "Path": path,
+            "Bytes": stat.st_size,
+            "LastUsed": stat.st_mtime,
+        })
+    return pd.DataFrame(rows, columns=["Session", "Driver", "LapNumber", "Path", "Bytes", "LastUsed"])
+
+
+def cache_size(cache_dir=None):
+    return int(list_cache_entries(cache_dir)["Bytes"].sum())
+
+
+def evict_cache(max_bytes=None, cache_dir=None):
+    limit = TELEMETRY_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = list_cache_entries(cache_dir).sort_values("LastUsed", ascending=False)
+
+    over = entries["Bytes"].cumsum() > limit
+    evicted = entries[over]
+    for path in evicted["Path"]:
+        path.unlink(missing_ok=True)
+    return len(evicted)